@@ -3,9 +3,11 @@ import json
 import logging
 import boto3
 import uuid
+import threading
 from datetime import datetime, timezone
 from bedrock_agentcore import BedrockAgentCoreApp
 from bedrock_agentcore.memory import MemoryClient
+from botocore.config import Config
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -22,18 +24,60 @@ SESSION_ID = "default_session"
 S3_BUCKET = "mysmslabbucket" # <-- YOUR S3 BUCKET NAME
 SNS_TOPIC_ARN = "arn:aws:sns:us-east-1:258652252690:mysmslabtopic" # <-- YOUR SNS TOPIC ARN
 
-# --- Lazy client getters ---
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+# Adaptive retries also slow the client itself down after throttling responses
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
+# --- Lazy client getters (each client is built once and shared by all requests) ---
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _shared_client(name, build):
+    client = _clients.get(name)
+    if client is None:
+        # Building clients from the default session is not thread-safe, so one at a time
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = build()
+    return client
+
+def get_client(service):
+    return _shared_client(service, lambda: boto3.client(service, region_name="us-east-1", config=AWS_CLIENT_CONFIG))
+
 def get_memory_client():
-    return MemoryClient(region_name="us-east-1")
+    return _shared_client("memory", lambda: MemoryClient(region_name="us-east-1"))
 
 def get_s3():
-    return boto3.client("s3", region_name="us-east-1")
+    return get_client("s3")
 
 def get_sns():
-    return boto3.client("sns", region_name="us-east-1")
+    return get_client("sns")
 
 def get_bedrock():
-    return boto3.client("bedrock-runtime", region_name="us-east-1")
+    return get_client("bedrock-runtime")
+
+def warm_up_clients():
+    """Builds every client (credentials, service models, endpoints) before the first request needs it."""
+    try:
+        for getter in (get_memory_client, get_s3, get_sns, get_bedrock):
+            getter()
+        logger.info("AWS clients ready")
+    except Exception as e:
+        logger.warning(f"Client warm-up failed, clients will be built on first use: {e}")
+
+# In the background, so a slow credential lookup never delays start-up
+threading.Thread(target=warm_up_clients, daemon=True).start()
 
 # --- Helper: publish to SNS ---
 def publish_to_sns(payload: dict):
@@ -1,6 +1,8 @@
 # app.py
 from flask import Flask, request, jsonify
 import requests
+from requests.adapters import HTTPAdapter
+import itertools
 import json
 import os
 
@@ -14,6 +16,50 @@ AWS_REGION = 'us-east-1'  # Hardcoded as requested
 # Tool name from your gateway configuration
 WEATHER_TOOL_NAME = "myWeatherTool___myWeatherTool" #REPLACE WITH YOUR TOOL NAME
 
+# Reusable gateway client: one pooled keep-alive session instead of a new TLS connection per call
+GATEWAY_POOL_SIZE = int(os.environ.get("GATEWAY_POOL_SIZE", "10"))
+GATEWAY_TIMEOUT = float(os.environ.get("GATEWAY_TIMEOUT", "30"))  # seconds, per call
+
+class GatewayClient:
+    """MCP JSON-RPC client for the AgentCore gateway over a pooled keep-alive session."""
+
+    def __init__(self, url: str, token_provider, pool_size: int = GATEWAY_POOL_SIZE,
+                 timeout: float = GATEWAY_TIMEOUT):
+        self.url = url
+        self._token_provider = token_provider  # () -> bearer token
+        self._timeout = timeout
+        self._ids = itertools.count(1)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        })
+
+    def post(self, payload, timeout: float = None) -> requests.Response:
+        headers = {"Authorization": "Bearer " + self._token_provider()}
+        return self._session.post(self.url, headers=headers, json=payload,
+                                  timeout=timeout or self._timeout)
+
+    def rpc(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def list_tools(self, timeout: float = None) -> list:
+        return self.rpc("tools/list", timeout=timeout).get("result", {}).get("tools", [])
+
+    def call_tool(self, name: str, arguments: dict, timeout: float = None) -> dict:
+        return self.rpc("tools/call", {"name": name, "arguments": arguments}, timeout=timeout)
+
+gateway = GatewayClient(GATEWAY_URL, lambda: OAUTH_TOKEN)
+
 def call_gateway_tool(tool_name, parameters):
     """Call AgentCore Gateway to invoke Lambda tools with OAuth token"""
     
@@ -32,24 +78,12 @@ def call_gateway_tool(tool_name, parameters):
             }
         }
         
-        # Headers with OAuth token from environment
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'Authorization': f'Bearer {OAUTH_TOKEN}'
-        }
-        
         print(f"Making request to gateway: {GATEWAY_URL}")
         print(f"Using OAuth token: {OAUTH_TOKEN[:20]}..." if OAUTH_TOKEN else "âŒ No OAuth token")
         print(f"Request payload: {json.dumps(payload, indent=2)}")
         
-        # Make the request to gateway
-        response = requests.post(
-            GATEWAY_URL,
-            data=json.dumps(payload),
-            headers=headers,
-            timeout=30
-        )
+        # Make the request to gateway (Bearer token is added by the client)
+        response = gateway.post(payload)
         
         print(f"Gateway response status: {response.status_code}")
         
@@ -1,11 +1,25 @@
 import os
+import re
 import json
 import logging
 import base64
+import time
+import threading
+import queue
+import itertools
+import hashlib
+import sqlite3
+import gzip
+import random
 import requests
 import boto3
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from bedrock_agentcore import BedrockAgentCoreApp
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # -----------------------------
@@ -21,8 +35,101 @@ logger = logging.getLogger(__name__)
 agent = BedrockAgentCoreApp()   # REQUIRED for AgentCore runtime
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
-bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-secrets = boto3.client("secretsmanager", region_name=AWS_REGION)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
+_aws_clients = {}
+_aws_clients_lock = threading.Lock()
+
+def get_client(service: str):
+    """The shared boto3 client for service, built once under a lock (the default session is not thread-safe)."""
+    client = _aws_clients.get(service)
+    if client is None:
+        with _aws_clients_lock:
+            client = _aws_clients.get(service)
+            if client is None:
+                client = _aws_clients[service] = boto3.client(service, region_name=AWS_REGION,
+                                                              config=AWS_CLIENT_CONFIG)
+    return client
+
+bedrock = get_client("bedrock-runtime")
+secrets = get_client("secretsmanager")
+
+# -----------------------------
+# Secrets Manager Cache
+# -----------------------------
+SECRET_CACHE_TTL = int(os.environ.get("SECRET_CACHE_TTL", "300"))  # seconds before revalidating
+
+class SecretCache:
+    """Parsed Secrets Manager values kept in memory and revalidated by VersionId once the TTL lapses."""
+
+    def __init__(self, client, ttl: int = SECRET_CACHE_TTL):
+        self._client = client
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # secret_id -> {"value", "version_id", "checked_at"}
+        self.stats = {"hits": 0, "revalidations": 0, "fetches": 0}
+
+    def get(self, secret_id: str):
+        with self._lock:
+            entry = self._entries.get(secret_id)
+            if entry and time.monotonic() - entry["checked_at"] < self._ttl:
+                self.stats["hits"] += 1
+                return self._copy(entry["value"])
+
+        # TTL lapsed: a DescribeSecret is enough if the current version is unchanged
+        if entry and entry["version_id"] and self._current_version(secret_id) == entry["version_id"]:
+            with self._lock:
+                entry["checked_at"] = time.monotonic()
+                self.stats["revalidations"] += 1
+            return self._copy(entry["value"])
+
+        resp = self._client.get_secret_value(SecretId=secret_id)
+        raw = resp.get("SecretString", "")
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw
+        self._store(secret_id, value, resp.get("VersionId"))
+        with self._lock:
+            self.stats["fetches"] += 1
+        return self._copy(value)
+
+    def _current_version(self, secret_id: str):
+        try:
+            meta = self._client.describe_secret(SecretId=secret_id)
+        except ClientError as e:
+            logger.warning(f"DescribeSecret failed for {secret_id}, refetching value: {e}")
+            return None
+        for version_id, stages in meta.get("VersionIdsToStages", {}).items():
+            if "AWSCURRENT" in stages:
+                return version_id
+        return None
+
+    def _store(self, secret_id: str, value, version_id: str):
+        with self._lock:
+            self._entries[secret_id] = {
+                "value": value,
+                "version_id": version_id,
+                "checked_at": time.monotonic(),
+            }
+
+    @staticmethod
+    def _copy(value):
+        # Callers may mutate the dict they get back (e.g. before a put)
+        return dict(value) if isinstance(value, dict) else value
+
+secret_cache = SecretCache(secrets)
 
 # -----------------------------
 # Configuration (ENV)
@@ -31,16 +138,92 @@ GATEWAY_URL = os.environ.get("GATEWAY_URL")
 WEATHER_AGENT_SECRET = os.environ.get("WEATHER_AGENT_SECRET")
 
 MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+ROUTE_MODEL_ID = os.environ.get("ROUTE_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0")  # JSON-only routing decisions
+SYNTHESIS_MODEL_ID = os.environ.get("SYNTHESIS_MODEL_ID", MODEL_ID)  # user-facing answers
 
 # -----------------------------
-# Fetch OAuth token dynamically
+# Fetch OAuth token dynamically (single-flight, refreshed before expiry)
 # -----------------------------
-def get_oauth_token():
+TOKEN_REFRESH_MARGIN = int(os.environ.get("TOKEN_REFRESH_MARGIN", "300"))  # seconds before expiry
+
+class TokenRefresher:
+    """Keeps one OAuth token warm in the background; concurrent callers share a single refresh."""
+
+    def __init__(self, fetch, margin: int = TOKEN_REFRESH_MARGIN):
+        self._fetch = fetch  # () -> (access_token, expires_in)
+        self._margin = margin
+        self._cond = threading.Condition()
+        self._token = None
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._refreshing = False
+        self._thread = None
+        self.stats = {"hits": 0, "refreshes": 0, "waits": 0, "errors": 0}
+
+    def get(self) -> str:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._token and now < self._refresh_at:
+                    self.stats["hits"] += 1
+                    return self._token
+                if not self._refreshing:
+                    self._refreshing = True
+                    break
+                if self._token and now < self._expires_at:
+                    # Still valid while another caller renews it
+                    self.stats["hits"] += 1
+                    return self._token
+                self.stats["waits"] += 1
+                self._cond.wait()
+        return self._do_refresh()
+
+    def _do_refresh(self) -> str:
+        # Caller must have set self._refreshing under the lock
+        try:
+            token, expires_in = self._fetch()
+        except Exception:
+            with self._cond:
+                self.stats["errors"] += 1
+                self._refreshing = False
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            now = time.monotonic()
+            self._token = token
+            self._expires_at = now + expires_in
+            self._refresh_at = self._expires_at - min(self._margin, expires_in // 2)
+            self.stats["refreshes"] += 1
+            self._refreshing = False
+            self._cond.notify_all()
+        logger.info(f"OAuth token refreshed (expires in {expires_in}s)")
+        return token
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="token-refresher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                delay = self._refresh_at - time.monotonic()
+                due = delay <= 0 and not self._refreshing
+                if due:
+                    self._refreshing = True
+            if not due:
+                time.sleep(max(delay, 1))
+                continue
+            try:
+                self._do_refresh()
+            except Exception as e:
+                logger.warning(f"Background token refresh failed: {e}")
+                time.sleep(5)
+
+def fetch_oauth_token():
     try:
-        secret_value = secrets.get_secret_value(
-            SecretId=WEATHER_AGENT_SECRET
-        )
-        secret = json.loads(secret_value["SecretString"])
+        secret = secret_cache.get(WEATHER_AGENT_SECRET)
 
         client_id = secret["CLIENT_ID"]
         client_secret = secret["CLIENT_SECRET"]
@@ -64,102 +247,738 @@ def get_oauth_token():
         response = requests.post(token_url, headers=headers, data=data, timeout=30)
         response.raise_for_status()
 
-        return response.json()["access_token"]
+        body = response.json()
+        return body["access_token"], int(body.get("expires_in", 3600))
 
     except Exception as e:
         logger.error(f"Failed to fetch OAuth token: {e}")
         raise
 
+oauth_refresher = TokenRefresher(fetch_oauth_token)
+
+def get_oauth_token():
+    oauth_refresher.start()
+    return oauth_refresher.get()
+
 # -----------------------------
-# Fetch tools dynamically
+# Gateway client (pooled, keep-alive)
 # -----------------------------
-def get_gateway_weather_tool(token):
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/list"
-    }
+GATEWAY_POOL_SIZE = int(os.environ.get("GATEWAY_POOL_SIZE", "10"))
+GATEWAY_TIMEOUT = float(os.environ.get("GATEWAY_TIMEOUT", "30"))  # seconds, per call
+GATEWAY_RETRIES = int(os.environ.get("GATEWAY_RETRIES", "2"))  # extra attempts for idempotent tools
+GATEWAY_BACKOFF_BASE = float(os.environ.get("GATEWAY_BACKOFF_BASE", "0.2"))  # seconds
+GATEWAY_BACKOFF_CAP = float(os.environ.get("GATEWAY_BACKOFF_CAP", "3"))  # seconds
+GATEWAY_HEDGE = os.environ.get("GATEWAY_HEDGE", "false").lower() == "true"  # duplicate slow calls after the tool's p95
+CIRCUIT_FAILURES = int(os.environ.get("CIRCUIT_FAILURES", "5"))  # consecutive failures that open a tool's circuit
+CIRCUIT_RESET = float(os.environ.get("CIRCUIT_RESET", "30"))  # seconds open before one trial call
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a tool whose circuit is open."""
+
+class ToolHealth:
+    """Per-tool circuit breakers plus recent call latencies, which set the hedge delay."""
+
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(self, failures: int = CIRCUIT_FAILURES, reset: float = CIRCUIT_RESET, window: int = 100):
+        self._failures = failures
+        self._reset = reset
+        self._window = window
+        self._lock = threading.Lock()
+        self._tools = {}  # name -> {"failures", "opened_at", "probing", "latencies"}
+        self.stats = {"retries": 0, "hedges": 0, "hedge_wins": 0, "short_circuits": 0, "circuit_opens": 0}
+
+    def _state(self, name: str) -> dict:
+        state = self._tools.get(name)
+        if state is None:
+            state = self._tools[name] = {
+                "failures": 0, "opened_at": None, "probing": False,
+                "latencies": deque(maxlen=self._window),
+            }
+        return state
+
+    def allow(self, name: str) -> bool:
+        """False while the circuit is open; after `reset` seconds one trial call goes through."""
+        with self._lock:
+            state = self._state(name)
+            if state["opened_at"] is None:
+                return True
+            if time.monotonic() - state["opened_at"] >= self._reset and not state["probing"]:
+                state["probing"] = True
+                return True
+            self.stats["short_circuits"] += 1
+            return False
+
+    def is_open(self, name: str) -> bool:
+        with self._lock:
+            return self._state(name)["opened_at"] is not None
 
-    response = requests.post(GATEWAY_URL, headers=headers, json=payload, timeout=30)
-    response.raise_for_status()
+    def record(self, name: str, ok: bool, latency: float = None):
+        with self._lock:
+            state = self._state(name)
+            state["probing"] = False
+            if ok:
+                state["failures"] = 0
+                state["opened_at"] = None
+                if latency is not None:
+                    state["latencies"].append(latency)
+                return
+            state["failures"] += 1
+            if state["failures"] >= self._failures:
+                if state["opened_at"] is None:
+                    self.stats["circuit_opens"] += 1
+                state["opened_at"] = time.monotonic()
 
-    result = response.json()
-    tools = result.get("result", {}).get("tools", [])
+    def note(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
 
+    def hedge_delay(self, name: str):
+        """The tool's p95 latency, or None until enough calls have been seen."""
+        with self._lock:
+            latencies = sorted(self._state(name)["latencies"])
+        if len(latencies) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+    def open_circuits(self) -> list:
+        with self._lock:
+            return sorted(n for n, s in self._tools.items() if s["opened_at"] is not None)
+
+    @staticmethod
+    def backoff(previous: float, base: float = GATEWAY_BACKOFF_BASE, cap: float = GATEWAY_BACKOFF_CAP) -> float:
+        # Decorrelated jitter: spreads retries out so they do not arrive in waves
+        return min(cap, random.uniform(base, max(base, previous) * 3))
+
+    @staticmethod
+    def is_tool_error(result) -> bool:
+        if not isinstance(result, dict) or "error" in result:
+            return True
+        inner = result.get("result")
+        return isinstance(inner, dict) and bool(inner.get("isError"))
+
+GATEWAY_GZIP_MIN_BYTES = int(os.environ.get("GATEWAY_GZIP_MIN_BYTES", "0"))  # gzip request bodies this large; 0 = never
+
+class TransferStats:
+    """Bytes per JSON-RPC method, as decoded JSON and as carried on the wire."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_method = {}
+
+    def record(self, payload, sent: int, sent_wire: int, received: int, received_wire: int):
+        method = payload.get("method") if isinstance(payload, dict) else "batch"
+        with self._lock:
+            totals = self.by_method.setdefault(method, {
+                "calls": 0, "sent_bytes": 0, "sent_wire_bytes": 0,
+                "received_bytes": 0, "received_wire_bytes": 0,
+            })
+            totals["calls"] += 1
+            totals["sent_bytes"] += sent
+            totals["sent_wire_bytes"] += sent_wire
+            totals["received_bytes"] += received
+            totals["received_wire_bytes"] += received_wire
+        logger.debug(f"{method}: sent {sent_wire}/{sent} B, received {received_wire}/{received} B (wire/decoded)")
+
+def encode_body(payload, gzip_min_bytes: int):
+    """JSON request body plus any Content-Encoding header; gzip only pays off on large bodies."""
+    body = json.dumps(payload).encode("utf-8")
+    if gzip_min_bytes and len(body) >= gzip_min_bytes:
+        return body, gzip.compress(body, compresslevel=5), {"Content-Encoding": "gzip"}
+    return body, body, {}
+
+class GatewayClient:
+    """MCP JSON-RPC client for the AgentCore gateway over a pooled keep-alive session."""
+
+    def __init__(self, url: str, token_provider, pool_size: int = GATEWAY_POOL_SIZE,
+                 timeout: float = GATEWAY_TIMEOUT, gzip_min_bytes: int = GATEWAY_GZIP_MIN_BYTES,
+                 transfer: TransferStats = None, retries: int = GATEWAY_RETRIES,
+                 hedge: bool = GATEWAY_HEDGE):
+        self.url = url
+        self._token_provider = token_provider  # () -> bearer token
+        self._timeout = timeout
+        self._ids = itertools.count(1)
+        self._retries = retries
+        self._hedge = hedge
+        self._hedge_pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="gateway-hedge")
+        self.health = ToolHealth()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            # gzip/deflate, plus br when brotli is installed; urllib3 decodes chunk by chunk
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        self._gzip_min_bytes = gzip_min_bytes
+        self.transfer = transfer or TransferStats()
+
+    def post(self, payload, timeout: float = None) -> requests.Response:
+        body, wire_body, headers = encode_body(payload, self._gzip_min_bytes)
+        headers["Authorization"] = "Bearer " + self._token_provider()
+        response = self._session.post(self.url, headers=headers, data=wire_body,
+                                      timeout=timeout or self._timeout)
+        if response.status_code == 415 and "Content-Encoding" in headers:
+            logger.warning("Gateway does not accept gzip request bodies; sending them uncompressed")
+            self._gzip_min_bytes = 0
+            return self.post(payload, timeout=timeout)
+        # raw.tell() counts the bytes read off the socket, before decompression
+        self.transfer.record(payload, len(body), len(wire_body), len(response.content), response.raw.tell())
+        return response
+
+    def rpc(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def list_tools(self, timeout: float = None) -> list:
+        return self.rpc("tools/list", timeout=timeout).get("result", {}).get("tools", [])
+
+    def call_tool(self, name: str, arguments: dict, timeout: float = None, idempotent: bool = True) -> dict:
+        """tools/call behind the tool's circuit breaker; idempotent calls are retried and may be hedged."""
+        if not self.health.allow(name):
+            raise CircuitOpenError(f"{name} is unavailable (circuit open after repeated failures)")
+        params = {"name": name, "arguments": arguments}
+        attempts = 1 + (self._retries if idempotent else 0)
+        delay = 0.0
+        for attempt in range(attempts):
+            start = time.monotonic()
+            try:
+                if idempotent and self._hedge:
+                    result = self._hedged_call(name, params, timeout)
+                else:
+                    result = self.rpc("tools/call", params, timeout=timeout)
+            except requests.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                if status is not None and status < 500 and status != 429:
+                    self.health.record(name, ok=True)  # the gateway answered; not an outage
+                    raise
+                self.health.record(name, ok=False)
+                if attempt + 1 == attempts or self.health.is_open(name):
+                    raise
+                delay = ToolHealth.backoff(delay)
+                self.health.note("retries")
+                logger.warning(f"{name} failed ({e}); retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            self.health.record(name, ok=not ToolHealth.is_tool_error(result), latency=time.monotonic() - start)
+            return result
+
+    def _hedged_call(self, name: str, params: dict, timeout: float = None) -> dict:
+        # A second identical request once the first has run past the tool's p95;
+        # whichever succeeds first wins
+        delay = self.health.hedge_delay(name)
+        if delay is None:
+            return self.rpc("tools/call", params, timeout=timeout)
+        first = self._hedge_pool.submit(self.rpc, "tools/call", params, timeout)
+        if wait([first], timeout=delay).done:
+            return first.result()
+        self.health.note("hedges")
+        second = self._hedge_pool.submit(self.rpc, "tools/call", params, timeout)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        self.health.note("hedge_wins")
+                    return future.result()
+        return first.result()  # both failed: raise the original error
+
+gateway = GatewayClient(GATEWAY_URL, get_oauth_token)
+
+# -----------------------------
+# Fetch tools dynamically (cached catalog)
+# -----------------------------
+TOOL_CATALOG_TTL = int(os.environ.get("TOOL_CATALOG_TTL", "300"))  # seconds before a background refresh
+
+class ToolCatalog:
+    """Cached tools/list result; a stale catalog is served while a background refresh runs."""
+
+    def __init__(self, load_tools, build_index, ttl: int = TOOL_CATALOG_TTL):
+        self._load_tools = load_tools    # () -> list of tool defs
+        self._build_index = build_index  # list of tool defs -> snapshot dict
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self.stats = {"hits": 0, "loads": 0, "background_refreshes": 0, "errors": 0}
+
+    def get(self) -> dict:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                self.stats["hits"] += 1
+                if time.monotonic() - self._loaded_at >= self._ttl and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._background_refresh, name="tool-catalog", daemon=True).start()
+                return snapshot
+        return self.refresh(only_if_empty=True)
+
+    def refresh(self, only_if_empty: bool = False) -> dict:
+        with self._load_lock:
+            if only_if_empty and self._snapshot is not None:
+                return self._snapshot
+            snapshot = self._build_index(self._load_tools())
+            with self._lock:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+                self.stats["loads"] += 1
+        return snapshot
+
+    def mark_stale(self):
+        """Next get() triggers a background refresh, e.g. after the planner names an unknown tool."""
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+            with self._lock:
+                self.stats["background_refreshes"] += 1
+        except Exception as e:
+            logger.warning(f"Tool catalog refresh failed, keeping previous catalog: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+def index_tools(tools):
+    weather_tool = None
     for tool in tools:
         if "weather" in tool.get("name", "").lower():
-            return tool["name"]
+            weather_tool = tool["name"]
+            break
+    return {"tools": tools, "weather_tool": weather_tool}
+
+tool_catalog = ToolCatalog(gateway.list_tools, index_tools)
+
+def get_gateway_weather_tool():
+    weather_tool = tool_catalog.get()["weather_tool"]
+    if weather_tool:
+        return weather_tool
 
+    tool_catalog.mark_stale()
     raise RuntimeError("No weather tool found in Gateway")
 
 # -----------------------------
-# Call Gateway weather tool
+# Request coalescing
 # -----------------------------
-def call_weather_tool(token, tool_name, city):
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": tool_name,
-            "arguments": {"city": city}
-        }
-    }
+class SingleFlight:
+    """Concurrent calls with the same key share one execution and its result (or error)."""
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> {"done": Event, "result", "error"}
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+                self.stats["executions"] += 1
+            else:
+                self.stats["coalesced"] += 1
 
-    response = requests.post(GATEWAY_URL, headers=headers, json=payload, timeout=30)
-    response.raise_for_status()
-    return response.json()
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            # Later arrivals start a fresh execution; only in-flight work is shared
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+def normalise_text(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+question_flight = SingleFlight()  # keyed on the normalised question
+tool_flight = SingleFlight()      # keyed on the tool and its resolved arguments
+
+# -----------------------------
+# Call Gateway weather tool
+# -----------------------------
+def call_weather_tool(tool_name, city):
+    # Differently worded questions about the same city share one tool call
+    return tool_flight.do(
+        (tool_name, normalise_text(city)),
+        lambda: gateway.call_tool(tool_name, {"city": city})
+    )
 
 # -----------------------------
 # Call Bedrock Claude Sonnet
 # -----------------------------
-def call_llm(prompt):
+LLM_CACHE_SIZE = int(os.environ.get("LLM_CACHE_SIZE", "512"))  # replies kept in memory, least recently used evicted
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", "3600"))  # seconds; 0 = never expire
+LLM_CACHE_DB = os.environ.get("LLM_CACHE_DB", "")  # SQLite file that survives restarts; empty = memory only
+
+class LLMResponseCache:
+    """Content-addressed cache of model replies: an in-memory LRU in front of an optional SQLite file."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_SIZE, ttl: int = LLM_CACHE_TTL, db_path: str = LLM_CACHE_DB):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (text, expires_at); wall clock, as disk entries outlive the process
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache "
+                             "(key TEXT PRIMARY KEY, text TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key(model_id: str, body: dict) -> str:
+        """Hash of the model id and the full request body (system prompt, messages, inference parameters)."""
+        canonical = json.dumps({"model": model_id, "body": body}, sort_keys=True,
+                               separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT text, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                    return row[0]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, text: str):
+        if not text:
+            return
+        expires_at = time.time() + self._ttl if self._ttl > 0 else float("inf")
+        with self._lock:
+            self._remember(key, text, expires_at)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache (key, text, expires_at) VALUES (?, ?, ?)",
+                                 (key, text, expires_at))
+
+    def _remember(self, key: str, text: str, expires_at: float):
+        self._entries[key] = (text, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+llm_cache = LLMResponseCache()
+
+# -----------------------------
+# Model routing and usage
+# -----------------------------
+# Model for each kind of call: routing replies are short JSON a small model handles
+# well; the text users read stays on the large model
+MODEL_BY_ROLE = {"route": ROUTE_MODEL_ID, "synthesise": SYNTHESIS_MODEL_ID}
+
+# USD per million input / output tokens by model family, for the cost estimate in /stats
+MODEL_PRICES = {
+    "claude-sonnet-4-5": (3.00, 15.00),
+    "claude-haiku-4-5": (1.00, 5.00),
+    "claude-3-sonnet": (3.00, 15.00),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+def estimate_cost(model_id, input_tokens, output_tokens):
+    price_in, price_out = next((p for family, p in MODEL_PRICES.items() if family in model_id), (0.0, 0.0))
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+class LLMUsage:
+    """Bedrock model calls, tokens, latency and estimated cost since start-up, per call role."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, role, model_id, seconds, input_tokens=0, output_tokens=0):
+        input_tokens, output_tokens = input_tokens or 0, output_tokens or 0
+        with self._lock:
+            stats = self._role(role)
+            stats["calls"] += 1
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+            stats["cost_usd"] = round(stats["cost_usd"] + estimate_cost(model_id, input_tokens, output_tokens), 6)
+            stats["total_ms"] += round(seconds * 1000)
+            stats["avg_ms"] = stats["total_ms"] // stats["calls"]
+            stats["models"][model_id] = stats["models"].get(model_id, 0) + 1
+        logger.info(f"LLM {role} on {model_id}: {input_tokens} in, {output_tokens} out, {seconds * 1000:.0f} ms")
+
+    def fallback(self, role):
+        with self._lock:
+            self._role(role)["fallbacks"] += 1
+
+    def _role(self, role):
+        if role not in self.stats:
+            self.stats[role] = {"calls": 0, "fallbacks": 0, "input_tokens": 0, "output_tokens": 0,
+                                "cost_usd": 0.0, "total_ms": 0, "avg_ms": 0, "models": {}}
+        return self.stats[role]
+
+llm_usage = LLMUsage()
+
+def text_deltas(response, usage):
+    """Text pieces of an invoke_model_with_response_stream reply, in order; token counts go into usage."""
+    for event in response["body"]:
+        chunk = json.loads(event["chunk"]["bytes"]) if "chunk" in event else {}
+        if chunk.get("type") == "content_block_delta" and chunk["delta"].get("type") == "text_delta":
+            yield chunk["delta"]["text"]
+        # Bedrock appends the token counts to the last chunk
+        metrics = chunk.get("amazon-bedrock-invocationMetrics")
+        if metrics:
+            usage.update(input_tokens=metrics.get("inputTokenCount"), output_tokens=metrics.get("outputTokenCount"))
+
+def invoke_llm(role, model_id, request_body, on_text=None):
+    """One Bedrock request for call_llm, timed and recorded in llm_usage under role."""
+    usage = {}
+    start = time.perf_counter()
+    if on_text:
+        response = bedrock.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=json.dumps(request_body).encode("utf-8"),
+            contentType="application/json",
+            accept="application/json"
+        )
+        parts = []
+        for text in text_deltas(response, usage):
+            parts.append(text)
+            on_text(text)
+        content = "".join(parts)
+    else:
+        response = bedrock.invoke_model(
+            modelId=model_id,
+            body=json.dumps(request_body).encode("utf-8"),
+            contentType="application/json",
+            accept="application/json"
+        )
+
+        body = json.loads(response["body"].read())
+        usage = {"input_tokens": body.get("usage", {}).get("input_tokens"),
+                 "output_tokens": body.get("usage", {}).get("output_tokens")}
+
+        # Claude may return list or string
+        content = body.get("content", "")
+        if isinstance(content, list):
+            content = content[0].get("text", "")
+    llm_usage.record(role, model_id, time.perf_counter() - start, **usage)
+    return content
+
+def call_llm(prompt, cache: bool = False, on_text=None, role: str = "synthesise", validate=None):
+    """
+    role ("route" or "synthesise") picks the model from MODEL_BY_ROLE.
+    validate, if given, checks a non-streamed reply; when the check fails (or the call errors) on a
+    smaller model, the request is repeated once on the synthesis model.
+    cache=True serves repeats of the exact same request from llm_cache; only for deterministic prompts.
+    on_text, if given, is called with each piece of the reply as Bedrock streams it.
+    """
     request_body = {
         "anthropic_version": "bedrock-2023-05-31",
         "messages": [{"role": "user", "content": prompt}],
         "max_tokens": 512,
         "temperature": 0.5
     }
+    model_id = MODEL_BY_ROLE[role]
+    cache_key = LLMResponseCache.key(model_id, request_body) if cache else None
+    if cache_key:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            if on_text:
+                on_text(cached)
+            return cached
 
-    response = bedrock.invoke_model(
-        modelId=MODEL_ID,
-        body=json.dumps(request_body).encode("utf-8"),
-        contentType="application/json",
-        accept="application/json"
-    )
-
-    body = json.loads(response["body"].read())
-
-    # Claude may return list or string
-    content = body.get("content", "")
-    if isinstance(content, list):
-        return content[0].get("text", "")
+    fallback_id = MODEL_BY_ROLE["synthesise"]
+    if validate and not on_text and model_id != fallback_id:
+        try:
+            content = invoke_llm(role, model_id, request_body)
+        except Exception as e:
+            logger.warning(f"LLM {role} call on {model_id} failed: {e}")
+            content = None
+        if content is None or not validate(content):
+            llm_usage.fallback(role)
+            logger.warning(f"LLM {role} reply from {model_id} unusable; retrying on {fallback_id}")
+            content = invoke_llm(role, fallback_id, request_body)
+            cache_key = None  # the key is for model_id, which did not answer
+    else:
+        content = invoke_llm(role, model_id, request_body, on_text)
+    if cache_key and (not validate or validate(content)):
+        llm_cache.put(cache_key, content)
     return content
 
 # -----------------------------
-# Main invocation endpoint
+# Startup Warm-up
 # -----------------------------
-@flask_app.route("/invocations", methods=["POST"])
-def invocations():
+WARMUP_ON_START = os.environ.get("WARMUP_ON_START", "true").lower() == "true"
+warmup_done = threading.Event()
+warmup_done.set()  # cleared only while a start-up warm-up runs
+
+def warm_up():
+    """Fetches the gateway token and discovers the weather tool before the first request."""
+    start = time.monotonic()
     try:
-        payload = json.loads(request.data.decode("utf-8"))
-        user_text = payload.get("input", {}).get("text", "")
+        get_oauth_token()           # Secrets Manager + Cognito
+        get_gateway_weather_tool()  # gateway DNS/TLS (kept in the pool) + tool discovery
+    except Exception as e:
+        logger.warning(f"Warm-up incomplete, continuing lazily: {e}")
+    finally:
+        warmup_done.set()
+        logger.info(f"Warm-up finished in {time.monotonic() - start:.2f}s")
+
+# -----------------------------
+# Local intent router
+# -----------------------------
+INTENT_MIN_CONFIDENCE = float(os.environ.get("INTENT_MIN_CONFIDENCE", "0.8"))  # below this the LLM decides; >1 = always
+
+# Lower-case name or alias -> city name passed to the weather tool
+CITY_GAZETTEER = {
+    "new york city": "New York City", "new york": "New York City", "nyc": "New York City",
+    "los angeles": "Los Angeles", "la": "Los Angeles", "san francisco": "San Francisco", "sf": "San Francisco",
+    "washington dc": "Washington DC", "washington d.c.": "Washington DC", "dc": "Washington DC",
+    "chicago": "Chicago", "chi": "Chicago", "boston": "Boston", "miami": "Miami", "seattle": "Seattle",
+    "houston": "Houston", "dallas": "Dallas", "austin": "Austin", "san antonio": "San Antonio",
+    "phoenix": "Phoenix", "philadelphia": "Philadelphia", "philly": "Philadelphia", "san diego": "San Diego",
+    "san jose": "San Jose", "denver": "Denver", "atlanta": "Atlanta", "las vegas": "Las Vegas",
+    "vegas": "Las Vegas", "portland": "Portland", "detroit": "Detroit", "minneapolis": "Minneapolis",
+    "nashville": "Nashville", "new orleans": "New Orleans", "salt lake city": "Salt Lake City",
+    "orlando": "Orlando", "tampa": "Tampa", "charlotte": "Charlotte", "pittsburgh": "Pittsburgh",
+    "st. louis": "St. Louis", "st louis": "St. Louis", "kansas city": "Kansas City", "baltimore": "Baltimore",
+    "honolulu": "Honolulu", "anchorage": "Anchorage", "santa monica": "Santa Monica",
+    "london": "London", "paris": "Paris", "berlin": "Berlin", "madrid": "Madrid", "rome": "Rome",
+    "amsterdam": "Amsterdam", "dublin": "Dublin", "lisbon": "Lisbon", "vienna": "Vienna",
+    "zurich": "Zurich", "stockholm": "Stockholm", "oslo": "Oslo", "copenhagen": "Copenhagen",
+    "moscow": "Moscow", "istanbul": "Istanbul", "dubai": "Dubai", "cairo": "Cairo",
+    "tokyo": "Tokyo", "seoul": "Seoul", "beijing": "Beijing", "shanghai": "Shanghai",
+    "hong kong": "Hong Kong", "singapore": "Singapore", "bangkok": "Bangkok", "mumbai": "Mumbai",
+    "bombay": "Mumbai", "delhi": "Delhi", "new delhi": "New Delhi", "bangalore": "Bangalore",
+    "bengaluru": "Bangalore", "hyderabad": "Hyderabad", "chennai": "Chennai", "kolkata": "Kolkata",
+    "sydney": "Sydney", "melbourne": "Melbourne", "auckland": "Auckland",
+    "toronto": "Toronto", "vancouver": "Vancouver", "montreal": "Montreal",
+    "mexico city": "Mexico City", "sao paulo": "Sao Paulo", "rio de janeiro": "Rio de Janeiro",
+    "buenos aires": "Buenos Aires", "johannesburg": "Johannesburg", "cape town": "Cape Town",
+}
+
+# Words that name weather outright, and words that only suggest it ("hot" deals, "cold" calls)
+WEATHER_WORDS_RE = re.compile(
+    r"\b(weather|forecast|temperatures?|temp|rain(?:ing|y)?|snow(?:ing|y)?|humid(?:ity)?|degrees|"
+    r"celsius|fahrenheit|precipitation|umbrella|thunderstorms?|drizzl\w*|hail(?:ing)?|sleet)\b", re.IGNORECASE)
+WEATHER_HINTS_RE = re.compile(
+    r"\b(hot|cold|warm|chilly|freezing|sunny|cloudy|wind|windy|storms?|stormy|jacket|coat|"
+    r"outside|outdoors?|beach|surf\w*|picnic|hike|hiking)\b", re.IGNORECASE)
+# Code, conversion and definition questions that merely mention weather words or cities
+OFF_TOPIC_RE = re.compile(
+    r"\b(python|excel|javascript|sql|code|function|formula|script|spreadsheet|convert\w*|conversion|"
+    r"define|definition|meaning|poem|song|lyrics|essay|haiku|story|plot|agency)\b", re.IGNORECASE)
+# A capitalised place after "in"/"for"/"at", for cities outside the gazetteer
+PLACE_RE = re.compile(r"\b(?:in|for|at)\s+([A-Z][\w.'-]*(?:\s+[A-Z][\w.'-]*){0,2})")
+NOT_PLACES = {"today", "tomorrow", "tonight", "the", "this", "next", "my", "our", "a", "an", "i"}
+# ", Texas" or ", ME" after a city: the gazetteer entry may be a different place
+REGION_RE = re.compile(r"\s*,\s*[A-Z][\w.]*(?:\s+[A-Z][\w.]*)?")
+
+class IntentRouter:
+    """
+    Keyword/regex weather-intent classifier with a city gazetteer. Answers in the same
+    shape as the LLM decision prompt, with a confidence; low-confidence questions still
+    go to the LLM.
+    """
+
+    def __init__(self, gazetteer: dict = CITY_GAZETTEER, min_confidence: float = INTENT_MIN_CONFIDENCE):
+        self._gazetteer = gazetteer
+        names = sorted(gazetteer, key=len, reverse=True)  # "new york city" before "new york"
+        self._city_re = re.compile(r"(?<![\w.])(" + "|".join(map(re.escape, names)) + r")(?![\w])", re.IGNORECASE)
+        self._min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self.stats = {"local": 0, "llm": 0}
+
+    def classify(self, text: str):
+        """(decision, confidence); decision is {"action": "weather", "city": ...} or {"action": "answer"}."""
+        text = text or ""
+        city, known = self._find_city(text)
+        weather = WEATHER_WORDS_RE.search(text)
+        if OFF_TOPIC_RE.search(text) and (weather or city or WEATHER_HINTS_RE.search(text)):
+            return {"action": "answer"}, 0.5       # "convert Celsius to Fahrenheit in Python"
+        if weather:
+            if city:
+                # An unknown capitalised word may not be a place at all ("at Home Depot")
+                return {"action": "weather", "city": city}, 0.95 if known else 0.6
+            return {"action": "weather"}, 0.5      # which city? let the LLM decide
+        if city:
+            if WEATHER_HINTS_RE.search(text):
+                return {"action": "weather", "city": city}, 0.7
+            return {"action": "answer"}, 0.5       # "tell me about Paris" or "surfing in Santa Monica?"
+        if WEATHER_HINTS_RE.search(text):
+            return {"action": "answer"}, 0.6
+        return {"action": "answer"}, 0.9
+
+    def route(self, text: str, fallback):
+        """The local decision when it is confident enough, otherwise fallback(text)."""
+        decision, confidence = self.classify(text)
+        local = confidence >= self._min_confidence
+        with self._lock:
+            self.stats["local" if local else "llm"] += 1
+        logger.info(f"Intent {decision} at {confidence:.2f} -> {'local' if local else 'LLM'}")
+        return decision if local else fallback(text)
 
-        token = get_oauth_token()
-        weather_tool = get_gateway_weather_tool(token)
+    def _find_city(self, text: str):
+        for match in self._city_re.finditer(text):
+            alias = match.group(1)
+            # Short aliases ("LA", "SF") only count in capitals, not as ordinary words ("la", "chi")
+            if len(alias) > 3 or alias.isupper() or alias.lower() == "nyc":
+                region = REGION_RE.match(text, match.end())
+                if region:
+                    return text[match.start():region.end()], False  # "Paris, Texas"
+                return self._gazetteer[alias.lower()], True
+        for place in PLACE_RE.findall(text):
+            words = place.split()
+            while words and words[-1].lower().strip(".'") in NOT_PLACES:
+                words.pop()
+            if words and words[0].lower() not in NOT_PLACES:
+                return " ".join(words).rstrip(".'"), False
+        return None, False
 
-        # Step 1: Ask LLM what to do
-        decision_prompt = f"""
+intent_router = IntentRouter()
+
+# -----------------------------
+# Agent pipeline
+# -----------------------------
+def valid_decision(raw):
+    """A routing reply the agent can act on: {"action":"answer"} or a weather action with a city."""
+    try:
+        decision = json.loads(raw.strip())
+    except json.JSONDecodeError:
+        return False
+    if not isinstance(decision, dict):
+        return False
+    return decision.get("action") == "answer" or (decision.get("action") == "weather" and bool(decision.get("city")))
+
+def llm_decision(user_text):
+    """Asks the LLM whether this is a weather question, and for which city."""
+    decision_prompt = f"""
 You are an AI agent.
 
 If the user is asking about weather (current or future), respond ONLY with JSON:
@@ -172,21 +991,28 @@ User input:
 {user_text}
 """
 
-        decision_raw = call_llm(decision_prompt)
-        decision_raw = decision_raw.strip()
+    decision_raw = call_llm(decision_prompt, cache=True, role="route", validate=valid_decision)
+    decision_raw = decision_raw.strip()
 
-        try:
-            decision = json.loads(decision_raw)
-        except json.JSONDecodeError:
-            decision = {"action": "answer"}
+    try:
+        return json.loads(decision_raw)
+    except json.JSONDecodeError:
+        return {"action": "answer"}
+
+def answer_question(user_text, on_text=None):
+    """Runs one question through the agent; on_text receives the user-facing answer as it streams."""
+    weather_tool = get_gateway_weather_tool()
+
+    # Step 1: Decide what to do, locally when the router is sure, otherwise via the LLM
+    decision = intent_router.route(user_text, llm_decision)
 
-        # Step 2: Weather path
-        if decision.get("action") == "weather":
-            city = decision.get("city", "New York City")
+    # Step 2: Weather path
+    if decision.get("action") == "weather":
+        city = decision.get("city", "New York City")
 
-            weather_data = call_weather_tool(token, weather_tool, city)
+        weather_data = call_weather_tool(weather_tool, city)
 
-            final_prompt = f"""
+        final_prompt = f"""
 Weather data:
 {json.dumps(weather_data, indent=2)}
 
@@ -195,11 +1021,54 @@ User question:
 
 Respond clearly and naturally.
 """
-            answer = call_llm(final_prompt)
+        answer = call_llm(final_prompt, on_text=on_text)
 
-        # Step 3: General LLM answer
-        else:
-            answer = call_llm(user_text)
+    # Step 3: General LLM answer
+    else:
+        answer = call_llm(user_text, on_text=on_text)
+
+    return answer
+
+# -----------------------------
+# Main invocation endpoint
+# -----------------------------
+def sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+def stream_answer(user_text):
+    """SSE events for one question: {"delta": ...} per answer piece, then the usual completion."""
+    events = queue.Queue()
+
+    def run():
+        try:
+            answer = answer_question(user_text, on_text=lambda text: events.put({"delta": text}))
+            events.put({"completion": answer, "stop_reason": "end_turn"})
+        except Exception as e:
+            logger.exception("Invocation failed")
+            events.put({"completion": f"Error: {str(e)}", "stop_reason": "end_turn"})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, name="answer-stream", daemon=True).start()
+    while (event := events.get()) is not None:
+        yield sse(event)
+
+def wants_stream(payload) -> bool:
+    return bool(payload.get("stream")) or "text/event-stream" in request.headers.get("Accept", "")
+
+@flask_app.route("/invocations", methods=["POST"])
+def invocations():
+    try:
+        payload = json.loads(request.data.decode("utf-8"))
+        user_text = payload.get("input", {}).get("text", "")
+
+        # A stream belongs to one caller, so streamed questions are not coalesced
+        if wants_stream(payload):
+            return Response(stream_answer(user_text), mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache"})
+
+        # Identical questions already in flight wait for that run instead of starting another
+        answer = question_flight.do(normalise_text(user_text), lambda: answer_question(user_text))
 
         return jsonify({
             "completion": answer,
@@ -216,12 +1085,31 @@ Respond clearly and naturally.
 # -----------------------------
 # Health endpoints
 # -----------------------------
+@flask_app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({
+        "oauth_token": oauth_refresher.stats,
+        "secrets": secret_cache.stats,
+        "tool_catalog": tool_catalog.stats,
+        "coalescing": {"questions": question_flight.stats, "tool_calls": tool_flight.stats},
+        "gateway": {**gateway.health.stats, "open_circuits": gateway.health.open_circuits()},
+        "gateway_transfer": gateway.transfer.by_method,
+        "llm_cache": llm_cache.stats,
+        "intent_router": intent_router.stats,
+        "llm": llm_usage.stats
+    }), 200
+
 @flask_app.route("/ping", methods=["GET"])
 def ping():
+    if not warmup_done.is_set():
+        return jsonify({"status": "HealthyBusy"}), 200  # as the AgentCore ping reports it
     return jsonify({"status": "ok"}), 200
 
 # -----------------------------
 # Run app
 # -----------------------------
 if __name__ == "__main__":
+    if WARMUP_ON_START:
+        warmup_done.clear()
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
     flask_app.run(host="0.0.0.0", port=8080, debug=True)
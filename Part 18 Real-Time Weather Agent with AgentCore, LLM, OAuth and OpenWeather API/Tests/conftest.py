@@ -0,0 +1,27 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PART_DIR = Path(__file__).resolve().parent.parent
+
+def load(name: str, path: Path):
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+@pytest.fixture(scope="session")
+def weather_lambda():
+    """The weather Lambda handler module, loaded from its file."""
+    return load("part18_lambda", PART_DIR / "Lambda" / "mylambdatool.py")
+
+@pytest.fixture(scope="session")
+def app():
+    """The agent module, loaded from its file without starting the server or warm-up."""
+    return load("part18_app", PART_DIR / "Agent Code" / "app.py")
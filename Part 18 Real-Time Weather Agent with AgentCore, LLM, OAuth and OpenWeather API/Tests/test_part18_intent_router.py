@@ -0,0 +1,51 @@
+import pytest
+
+@pytest.mark.parametrize("text, city", [
+    ("What's the weather in Chicago today?", "Chicago"),
+    ("weather in nyc", "New York City"),
+    ("Forecast for New York City tomorrow", "New York City"),
+    ("Will it rain in LA?", "Los Angeles"),
+])
+def test_clear_weather_questions_are_routed_locally(app, text, city):
+    router = app.IntentRouter()
+    fallback_calls = []
+
+    decision = router.route(text, fallback_calls.append)
+
+    assert decision == {"action": "weather", "city": city}
+    assert fallback_calls == []
+
+@pytest.mark.parametrize("text", [
+    "Write a haiku about autumn",
+    "la la land is a great film",
+])
+def test_non_weather_questions_are_answered_without_the_llm(app, text):
+    router = app.IntentRouter()
+
+    assert router.route(text, lambda t: pytest.fail("LLM called")) == {"action": "answer"}
+
+@pytest.mark.parametrize("text", [
+    "Is it cold outside?",              # weather, but which city?
+    "Tell me about Paris",              # a city, but not weather
+    "Any good hot deals in Boston?",    # a hint word, not weather
+    "What's the temperature in Pune?",  # a capitalised word outside the gazetteer
+    "What's the weather at Home Depot?",
+    "How do I convert Celsius to Fahrenheit in Python?",
+    "Write a poem about rain in Spain",
+    "Explain the forecast function in Excel",
+    "What does the temp agency in Boston charge?",
+    "Show me Python code to plot temperature data for Chicago",
+    "What's the weather in Paris, Texas?",      # not the gazetteer's Paris
+    "Weather in Portland, Maine tomorrow",
+])
+def test_ambiguous_questions_go_to_the_llm(app, text):
+    router = app.IntentRouter()
+    llm = {"action": "answer", "from": "llm"}
+
+    assert router.route(text, lambda t: llm) is llm
+    assert router.stats == {"local": 0, "llm": 1}
+
+def test_confidence_above_one_always_asks_the_llm(app):
+    router = app.IntentRouter(min_confidence=1.1)
+
+    assert router.route("weather in Chicago", lambda t: {"action": "answer"}) == {"action": "answer"}
@@ -0,0 +1,52 @@
+import json
+import time
+
+class FakeSecrets:
+    def __init__(self, value: dict, version_id: str = "v1"):
+        self.value, self.version_id = value, version_id
+        self.calls = []
+
+    def get_secret_value(self, SecretId):
+        self.calls.append("get")
+        return {"SecretString": json.dumps(self.value), "VersionId": self.version_id}
+
+    def describe_secret(self, SecretId):
+        self.calls.append("describe")
+        return {"VersionIdsToStages": {self.version_id: ["AWSCURRENT"]}}
+
+def test_cache_file_is_reused_by_a_new_cache(weather_lambda, tmp_path):
+    path = str(tmp_path / "secrets.json")
+    client = FakeSecrets({"apiKey": "k1"})
+    weather_lambda.SecretCache(client, path=path).get("weather")
+
+    cache = weather_lambda.SecretCache(client, path=path)
+
+    assert cache.get("weather") == {"apiKey": "k1"}
+    assert client.calls == ["get"]
+    assert cache.stats["disk_loads"] == 1
+
+def test_malformed_entries_are_skipped_and_dropped_from_the_file(weather_lambda, tmp_path):
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps({
+        "good": {"value": {"apiKey": "k1"}, "version_id": "v1", "saved_at": time.time()},
+        "no_value": {"version_id": "v1", "saved_at": time.time()},
+        "bad_time": {"value": "x", "saved_at": "yesterday"},
+        "not_a_dict": ["x"],
+    }))
+    client = FakeSecrets({"apiKey": "fresh"})
+
+    cache = weather_lambda.SecretCache(client, path=str(path))
+
+    assert cache.get("good") == {"apiKey": "k1"}
+    assert client.calls == []
+    assert set(json.loads(path.read_text())) == {"good"}
+
+def test_unreadable_file_is_deleted(weather_lambda, tmp_path):
+    path = tmp_path / "secrets.json"
+    for content in ("{not json", json.dumps(["a", "list"])):
+        path.write_text(content)
+
+        cache = weather_lambda.SecretCache(FakeSecrets({"apiKey": "k1"}), path=str(path))
+
+        assert cache.stats["disk_loads"] == 0
+        assert not path.exists()
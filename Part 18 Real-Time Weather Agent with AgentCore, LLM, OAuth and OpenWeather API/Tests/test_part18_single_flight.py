@@ -0,0 +1,61 @@
+import threading
+import time
+
+def run_concurrently(n: int, target):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+def test_identical_concurrent_calls_share_one_execution(app):
+    flight = app.SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(None)
+        time.sleep(0.1)
+        return "sunny"
+
+    results = run_concurrently(5, lambda: flight.do("chicago", fn))
+
+    assert results == ["sunny"] * 5
+    assert len(calls) == 1
+    assert flight.stats == {"executions": 1, "coalesced": 4}
+
+def test_waiters_get_the_leaders_error(app):
+    flight = app.SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fn():
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError("gateway down")
+
+    def call():
+        try:
+            flight.do("chicago", fn)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    run_concurrently(3, call)
+    leader.join()
+
+    assert len(errors) == 4
+    assert len({id(e) for e in errors}) == 1
+
+def test_finished_calls_are_not_reused(app):
+    flight = app.SingleFlight()
+    counter = iter(range(10))
+
+    assert flight.do("chicago", lambda: next(counter)) == 0
+    assert flight.do("chicago", lambda: next(counter)) == 1
+
+def test_questions_differing_in_case_and_spacing_are_coalesced(app):
+    assert app.normalise_text("  Weather in  CHICAGO ") == app.normalise_text("weather in chicago")
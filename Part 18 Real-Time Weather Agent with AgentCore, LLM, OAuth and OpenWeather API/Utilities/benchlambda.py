@@ -0,0 +1,109 @@
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import boto3
+
+# Benchmarks cold vs warm lambda_handler latency for the weather Lambda.
+# Secrets Manager and OpenWeather are replaced by local stand-ins, so no AWS
+# account or API key is needed.
+#
+#   python benchlambda.py                                   # Part 18 Lambda
+#   python benchlambda.py "../../Part 19 Multi-tool Gateway/Lambda/mylambdatool.py"
+
+LAMBDA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lambda", "mylambdatool.py")
+SECRETS_LATENCY = 0.060  # simulated Secrets Manager round trip (seconds)
+WARM_INVOCATIONS = 50
+EVENT = {"city": "Chicago"}
+
+
+class LocalSecretsManager:
+    """Stand-in for the boto3 secretsmanager client with a fixed network delay."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def get_secret_value(self, SecretId):
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"SecretString": json.dumps({"OPENWEATHER_API_KEY": "local-key"}), "VersionId": "v1"}
+
+    def describe_secret(self, SecretId):
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"VersionIdsToStages": {"v1": ["AWSCURRENT"]}}
+
+
+class LocalWeatherResponse:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self):
+        return json.dumps({"main": {"temp": 55.4}, "weather": [{"description": "clear sky"}]}).encode()
+
+
+def load_lambda(path, secrets_stub, env):
+    """Imports the Lambda module fresh, the way a new execution environment would."""
+    os.environ.update(env)
+    real_client = boto3.client
+    boto3.client = lambda service, **kwargs: secrets_stub
+    try:
+        spec = importlib.util.spec_from_file_location("mylambdatool", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        boto3.client = real_client
+        for key in env:
+            os.environ.pop(key, None)
+    module.request.urlopen = lambda url, timeout=None: LocalWeatherResponse()
+    return module
+
+
+def timed_invoke(module):
+    start = time.perf_counter()
+    result = module.lambda_handler(EVENT, None)
+    elapsed = (time.perf_counter() - start) * 1000
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return elapsed
+
+
+def run_scenario(name, path, env):
+    stub = LocalSecretsManager(SECRETS_LATENCY)
+    module = load_lambda(path, stub, env)
+
+    cold_ms = timed_invoke(module)
+    cold_calls = stub.calls
+
+    warm = [timed_invoke(module) for _ in range(WARM_INVOCATIONS)]
+    warm_calls = (stub.calls - cold_calls) / WARM_INVOCATIONS
+
+    print(f"{name:<34} {cold_ms:>9.1f} {cold_calls:>10} "
+          f"{statistics.median(warm):>9.2f} {max(warm):>9.2f} {warm_calls:>10.2f}")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else LAMBDA_PATH
+    cache_file = os.path.join(tempfile.mkdtemp(), "secret_cache.json")
+
+    print(f"Lambda: {os.path.normpath(path)}")
+    print(f"Simulated Secrets Manager latency: {SECRETS_LATENCY * 1000:.0f} ms, "
+          f"{WARM_INVOCATIONS} warm invocations\n")
+    print(f"{'Scenario':<34} {'cold ms':>9} {'cold SM':>10} {'warm p50':>9} {'warm max':>9} {'SM/warm':>10}")
+
+    run_scenario("no caching (TTL=0)", path, {"SECRET_CACHE_TTL": "0"})
+    run_scenario("in-memory cache", path, {})
+    run_scenario("in-memory + /tmp file (first)", path, {"SECRET_CACHE_FILE": cache_file})
+    run_scenario("in-memory + /tmp file (re-import)", path, {"SECRET_CACHE_FILE": cache_file})
+
+
+if __name__ == "__main__":
+    main()
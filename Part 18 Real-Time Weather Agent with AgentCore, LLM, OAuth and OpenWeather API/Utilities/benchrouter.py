@@ -0,0 +1,84 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import boto3
+
+# Routing accuracy and decision latency of the local intent router in app.py,
+# measured on the labelled questions in intentcases.json. Questions the router
+# is unsure about fall back to the LLM decision call. Fallbacks are charged the
+# LLM_DECISION_MS below and assumed to route correctly, so "overall" is an
+# upper bound; "local accuracy" is what the router itself gets right.
+#
+#   python benchrouter.py                  # labelled set in intentcases.json
+#   python benchrouter.py mycases.json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(HERE, "..", "Agent Code", "app.py")
+CASES_PATH = os.path.join(HERE, "intentcases.json")
+LLM_DECISION_MS = 1500.0  # one Claude decision call (typical 1-2 s)
+REPEATS = 200             # classify() runs per question when timing the router
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.01]
+
+
+def load_app():
+    """Imports app.py with stand-in AWS clients; nothing is called over the network."""
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    real_client = boto3.client
+    boto3.client = lambda service, **kwargs: None
+    try:
+        spec = importlib.util.spec_from_file_location("weather_app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        boto3.client = real_client
+    return module
+
+
+def is_correct(decision, case):
+    if decision.get("action") != case["action"]:
+        return False
+    if case["action"] == "weather" and case.get("city"):
+        return (decision.get("city") or "").lower() == case["city"].lower()
+    return True
+
+
+def main():
+    app = load_app()
+    with open(sys.argv[1] if len(sys.argv) > 1 else CASES_PATH) as f:
+        cases = json.load(f)
+
+    results = []
+    for case in cases:
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            decision, confidence = app.intent_router.classify(case["text"])
+        elapsed_ms = (time.perf_counter() - start) * 1000 / REPEATS
+        results.append((case, decision, confidence, elapsed_ms))
+
+    router_ms = sum(r[3] for r in results) / len(results)
+    print(f"{len(cases)} labelled questions, router {router_ms * 1000:.1f} us/question, "
+          f"LLM decision {LLM_DECISION_MS:.0f} ms (simulated)\n")
+    print(f"{'threshold':>9} {'local':>7} {'local acc':>10} {'overall':>8} {'decide ms':>10} {'saved ms':>9}")
+    for threshold in THRESHOLDS:
+        local = [r for r in results if r[2] >= threshold]
+        local_correct = sum(is_correct(r[1], r[0]) for r in local)
+        fallbacks = len(results) - len(local)
+        decide_ms = (sum(r[3] for r in local) + fallbacks * LLM_DECISION_MS) / len(results)
+        marker = "  <- INTENT_MIN_CONFIDENCE" if threshold == app.INTENT_MIN_CONFIDENCE else ""
+        print(f"{threshold:>9.2f} {len(local) / len(results):>7.0%} "
+              f"{(local_correct / len(local)) if local else 1:>10.0%} "
+              f"{(local_correct + fallbacks) / len(results):>8.0%} "
+              f"{decide_ms:>10.1f} {LLM_DECISION_MS - decide_ms:>9.1f}{marker}")
+
+    wrong = [r for r in results if r[2] >= app.INTENT_MIN_CONFIDENCE and not is_correct(r[1], r[0])]
+    if wrong:
+        print("\nRouted locally but wrong:")
+        for case, decision, confidence, _ in wrong:
+            print(f"  {confidence:.2f} {decision} <- {case['text']!r} (expected {case['action']} {case.get('city') or ''})")
+
+
+if __name__ == "__main__":
+    main()
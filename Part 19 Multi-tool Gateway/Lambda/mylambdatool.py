@@ -1,7 +1,10 @@
 import json
 import logging
 import os
+import time
+import threading
 import boto3
+from botocore.exceptions import ClientError
 from urllib import request, parse, error
 
 logger = logging.getLogger()
@@ -14,12 +17,135 @@ REGION = os.environ.get("AWS_REGION", "us-east-1") #REPLACE WITH YOUR REGION
 # Secrets Manager client
 secrets_client = boto3.client("secretsmanager", region_name=REGION)
 
+# Parsed secrets cached for the life of the execution environment (warm starts).
+# Set SECRET_CACHE_FILE (e.g. /tmp/secret_cache.json) to also keep a copy on local disk
+# that survives a re-import of this module within the same environment. Off by default:
+# the file holds the OpenWeather API key in plaintext, readable by any code in the environment.
+SECRET_CACHE_TTL = int(os.environ.get("SECRET_CACHE_TTL", "300"))  # seconds before revalidating
+SECRET_CACHE_FILE = os.environ.get("SECRET_CACHE_FILE")
+
+class SecretCache:
+    """Parsed Secrets Manager values kept in memory and revalidated by VersionId once the TTL lapses."""
+
+    def __init__(self, client, ttl: int = SECRET_CACHE_TTL, path: str = SECRET_CACHE_FILE):
+        self._client = client
+        self._ttl = ttl
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = {}  # secret_id -> {"value", "version_id", "checked_at"}
+        self.stats = {"hits": 0, "revalidations": 0, "fetches": 0, "disk_loads": 0}
+        self._load()
+
+    def get(self, secret_id: str):
+        with self._lock:
+            entry = self._entries.get(secret_id)
+            if entry and time.monotonic() - entry["checked_at"] < self._ttl:
+                self.stats["hits"] += 1
+                return self._copy(entry["value"])
+
+        # TTL lapsed: a DescribeSecret is enough if the current version is unchanged
+        if entry and entry["version_id"] and self._current_version(secret_id) == entry["version_id"]:
+            with self._lock:
+                entry["checked_at"] = time.monotonic()
+                self.stats["revalidations"] += 1
+                self._persist()
+            return self._copy(entry["value"])
+
+        resp = self._client.get_secret_value(SecretId=secret_id)
+        raw = resp.get("SecretString", "")
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw
+        self._store(secret_id, value, resp.get("VersionId"))
+        with self._lock:
+            self.stats["fetches"] += 1
+        return self._copy(value)
+
+    def _current_version(self, secret_id: str):
+        try:
+            meta = self._client.describe_secret(SecretId=secret_id)
+        except ClientError as e:
+            logger.warning(f"DescribeSecret failed for {secret_id}, refetching value: {e}")
+            return None
+        for version_id, stages in meta.get("VersionIdsToStages", {}).items():
+            if "AWSCURRENT" in stages:
+                return version_id
+        return None
+
+    def _store(self, secret_id: str, value, version_id: str):
+        with self._lock:
+            self._entries[secret_id] = {
+                "value": value,
+                "version_id": version_id,
+                "checked_at": time.monotonic(),
+            }
+            self._persist()
+
+    def _load(self):
+        if not self._path or not os.path.exists(self._path):
+            return
+        # Stored ages are wall-clock; map them back onto the monotonic clock
+        now_wall, now_mono = time.time(), time.monotonic()
+        skipped = 0
+        try:
+            with open(self._path) as f:
+                saved = json.load(f)
+            for secret_id, entry in saved.items():
+                try:
+                    self._entries[secret_id] = {
+                        "value": entry["value"],
+                        "version_id": entry.get("version_id"),
+                        "checked_at": now_mono - max(now_wall - float(entry["saved_at"]), 0),
+                    }
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    skipped += 1
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Discarding unreadable secret cache file {self._path}: {e}")
+            self._entries.clear()
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            return
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed entries in secret cache file {self._path}")
+            self._persist()  # rewrite the file without them
+        self.stats["disk_loads"] += 1
+
+    def _persist(self):
+        # Caller holds self._lock
+        if not self._path:
+            return
+        now_wall, now_mono = time.time(), time.monotonic()
+        saved = {
+            secret_id: {
+                "value": entry["value"],
+                "version_id": entry["version_id"],
+                "saved_at": now_wall - (now_mono - entry["checked_at"]),
+            }
+            for secret_id, entry in self._entries.items()
+        }
+        tmp_path = self._path + ".tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Could not write secret cache file {self._path}: {e}")
+
+    @staticmethod
+    def _copy(value):
+        # Callers may mutate the dict they get back (e.g. before a put)
+        return dict(value) if isinstance(value, dict) else value
+
+secret_cache = SecretCache(secrets_client)
+
 def get_api_key():
     """Fetch OpenWeather API key from Secrets Manager (JSON secret)"""
     try:
-        response = secrets_client.get_secret_value(SecretId=SECRET_NAME)
-        secret_value = response.get("SecretString", "")
-        secret_json = json.loads(secret_value)
+        secret_json = secret_cache.get(SECRET_NAME)
         api_key = secret_json.get("OPENWEATHER_API_KEY")
         if not api_key:
             raise ValueError("API key not found in secret")
@@ -1,6 +1,12 @@
 import requests
+from requests.adapters import HTTPAdapter
 import base64
+import itertools
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 
 # =========================
 # REPLACE CONFIG AND TOOL NAMES
@@ -45,42 +51,150 @@ def get_access_token():
 # GATEWAY CALLS
 # =========================
 
-def list_tools(token):
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/list"
-    }
+GATEWAY_POOL_SIZE = int(os.environ.get("GATEWAY_POOL_SIZE", "10"))
+GATEWAY_TIMEOUT = float(os.environ.get("GATEWAY_TIMEOUT", "30"))  # seconds, per call
+
+class GatewayClient:
+    """MCP JSON-RPC client for the AgentCore gateway over a pooled keep-alive session."""
+
+    def __init__(self, url: str, token_provider, pool_size: int = GATEWAY_POOL_SIZE,
+                 timeout: float = GATEWAY_TIMEOUT):
+        self.url = url
+        self._token_provider = token_provider  # () -> bearer token
+        self._timeout = timeout
+        self._ids = itertools.count(1)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        })
+
+    def post(self, payload, timeout: float = None) -> requests.Response:
+        headers = {"Authorization": "Bearer " + self._token_provider()}
+        return self._session.post(self.url, headers=headers, json=payload,
+                                  timeout=timeout or self._timeout)
+
+    def rpc(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def list_tools(self, timeout: float = None) -> list:
+        return self.rpc("tools/list", timeout=timeout).get("result", {}).get("tools", [])
+
+    def call_tool(self, name: str, arguments: dict, timeout: float = None) -> dict:
+        return self.rpc("tools/call", {"name": name, "arguments": arguments}, timeout=timeout)
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
 
-    r = requests.post(GATEWAY_URL, headers=headers, json=payload)
-    r.raise_for_status()
-    return r.json()["result"]["tools"]
-
-
-def call_tool(token, tool_name, arguments):
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": tool_name,
-            "arguments": arguments
-        }
-    }
+# =========================
+# TOOL RESULT CACHE
+# =========================
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+TOOL_CACHE_SIZE = int(os.environ.get("TOOL_CACHE_SIZE", "256"))  # entries, least recently used evicted
+TOOL_CACHE_DEFAULT_TTL = int(os.environ.get("TOOL_CACHE_DEFAULT_TTL", "0"))  # seconds; 0 = not cached
+# Seconds per tool, keyed by full tool name or by the operation after "___".
+# TOOL_CACHE_TTLS='{"getCityWeather": 300}' adds to / overrides these.
+TOOL_CACHE_TTLS = {
+    "getCityWeather": 600,    # current conditions
+    "forwardGeocode": 86400,  # place coordinates
+    **json.loads(os.environ.get("TOOL_CACHE_TTLS", "{}")),
+}
+# Arguments whose values are looked up case-insensitively; IDs, file names and free text keep their case
+TOOL_CACHE_CASELESS_ARGS = frozenset({"city", "q", "location"})
+
+
+class ToolResultCache:
+    """LRU cache of successful tools/call results keyed by tool name and canonical arguments."""
+
+    def __init__(self, ttls: dict = TOOL_CACHE_TTLS, default_ttl: int = TOOL_CACHE_DEFAULT_TTL,
+                 max_entries: int = TOOL_CACHE_SIZE, never_cache=None):
+        self._ttls = ttls
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._never_cache = never_cache or (lambda name: False)  # name -> True for side-effecting tools
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (result, expires_at)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def ttl(self, name: str) -> int:
+        if self._never_cache(name):
+            return 0
+        return self._ttls.get(name, self._ttls.get(name.split("___")[-1], self._default_ttl))
+
+    def key(self, name: str, arguments: dict):
+        """Cache key for this call, or None if the tool's results are not cached."""
+        if self.ttl(name) <= 0:
+            return None
+        return name + ":" + json.dumps(self._canonical(arguments), sort_keys=True, separators=(",", ":"))
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, name: str, key: str, result: dict):
+        if not isinstance(result, dict) or "error" in result:
+            return
+        inner = result.get("result")
+        if isinstance(inner, dict) and inner.get("isError"):
+            return
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + self.ttl(name))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    @classmethod
+    def _canonical(cls, value, caseless: bool = False):
+        # " Chicago" and "chicago" are the same city lookup
+        if isinstance(value, str):
+            value = " ".join(value.split())
+            return value.lower() if caseless else value
+        if isinstance(value, dict):
+            return {k: cls._canonical(v, k in TOOL_CACHE_CASELESS_ARGS) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._canonical(v, caseless) for v in value]
+        return value
+
+
+# Slack posts are side effects and must reach Slack every time
+tool_cache = ToolResultCache(never_cache=lambda name: name == SLACK_TOOL or "slack" in name.lower())
 
-    r = requests.post(GATEWAY_URL, headers=headers, json=payload)
-    r.raise_for_status()
-    return r.json()
+
+# =========================
+# GATEWAY TOOL FUNCTIONS
+# =========================
+
+def list_tools(gateway):
+    return gateway.list_tools()
+
+
+def call_tool(gateway, tool_name, arguments):
+    key = tool_cache.key(tool_name, arguments)
+    result = tool_cache.get(key) if key else None
+    if result is not None:
+        print(f"(cached result for {tool_name})")
+        return result
+
+    result = gateway.call_tool(tool_name, arguments)
+    if key:
+        tool_cache.put(tool_name, key, result)
+    return result
 
 
 # =========================
@@ -101,6 +215,7 @@ def main():
     print("\n=== Multi-Tool Gateway Interactive Test ===")
 
     token = get_access_token()
+    gateway = GatewayClient(GATEWAY_URL, lambda: token)
 
     while True:
         print("""
@@ -114,19 +229,19 @@ def main():
         choice = input("Select an option: ").strip()
 
         if choice == "1":
-            tools = list_tools(token)
+            tools = list_tools(gateway)
             print_tools(tools)
 
         elif choice == "2":
             city = input("Enter city name: ")
-            resp = call_tool(token, WEATHER_TOOL, {"city": city})
+            resp = call_tool(gateway, WEATHER_TOOL, {"city": city})
             print("\n=== Tool Response ===")
             print(json.dumps(resp, indent=2))
 
         elif choice == "3":
             location = input("Enter location (e.g. Boston): ")
             resp = call_tool(
-                token,
+                gateway,
                 LOCATION_TOOL,
                 {
                     "q": location,
@@ -141,7 +256,7 @@ def main():
             channel = input("Enter Slack channel (e.g. #social): ")
             message = input("Enter message: ")
             resp = call_tool(
-                token,
+                gateway,
                 SLACK_TOOL,
                 {
                     "channel": channel,
@@ -152,6 +267,7 @@ def main():
             print(json.dumps(resp, indent=2))
 
         elif choice == "0":
+            print(f"Tool cache: {tool_cache.stats}")
             print("Exiting.")
             break
 
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+def test_failed_call_gives_its_token_reservation_back(app):
+    limiter = app.BedrockRateLimiter(rpm=0, tpm=6000)
+
+    async def main():
+        reserved = await limiter.acquire(5000)
+        await limiter.release(reserved)  # the call failed
+        start = time.monotonic()
+        reserved = await limiter.acquire(5000)  # ~50 s away if the first reservation were kept
+        return reserved, time.monotonic() - start
+
+    reserved, waited = asyncio.run(main())
+
+    assert reserved == 5000
+    assert waited < 0.1
+
+def test_completed_call_is_charged_what_it_used(app):
+    limiter = app.BedrockRateLimiter(rpm=0, tpm=60000)  # 1000 tokens a second
+
+    async def main():
+        reserved = await limiter.acquire(50000)
+        await limiter.release(reserved, 10000)  # 40000 of the reservation come back
+        await limiter.acquire(50000)            # all that is left
+        start = time.monotonic()
+        await limiter.acquire(300)
+        return time.monotonic() - start
+
+    waited = asyncio.run(main())
+
+    assert 0.2 < waited < 0.6
+
+def test_throttle_cuts_the_rate_once_and_completions_win_it_back(app):
+    limiter = app.BedrockRateLimiter(rpm=600, tpm=0)
+
+    limiter.throttled()
+    limiter.throttled()  # same burst, within DECREASE_GAP
+
+    assert limiter.stats["throttles"] == 2
+    assert limiter.stats["rate_scale"] == limiter.DECREASE
+
+    async def main():
+        await limiter.release(await limiter.acquire(10), 10)
+
+    asyncio.run(main())
+
+    assert limiter.stats["rate_scale"] == limiter.DECREASE + limiter.INCREASE
+
+def test_interactive_calls_go_before_waiting_background_calls(app):
+    limiter = app.BedrockRateLimiter(rpm=120, tpm=0)  # one request every 0.5 s once the bucket is empty
+    order = []
+
+    async def call(priority, label):
+        app.bedrock_priority.set(priority)
+        await limiter.acquire(0)
+        order.append(label)
+
+    async def main():
+        for _ in range(120):
+            await limiter.acquire(0)  # empty the bucket
+        background = asyncio.create_task(call(app.PRIORITY_BACKGROUND, "background"))
+        await asyncio.sleep(0.05)
+        interactive = asyncio.create_task(call(app.PRIORITY_INTERACTIVE, "interactive"))
+        await asyncio.gather(background, interactive)
+
+    asyncio.run(main())
+
+    assert order == ["interactive", "background"]
+    assert limiter.stats["background_calls"] == 1
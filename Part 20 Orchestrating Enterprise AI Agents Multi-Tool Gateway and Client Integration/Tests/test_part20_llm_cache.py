@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+PLAN = '[{"action": "answer"}]'
+
+def fake_models(app, monkeypatch, replies: dict):
+    """Replaces invoke_llm with canned replies per model id; returns the model ids called."""
+    called = []
+
+    async def invoke_llm(role, model_id, body, on_text=None):
+        called.append(model_id)
+        return replies[model_id]
+
+    monkeypatch.setattr(app, "invoke_llm", invoke_llm)
+    monkeypatch.setattr(app, "llm_cache", app.LLMResponseCache(db_path=""))
+    return called
+
+def plan(app, text):
+    return asyncio.run(app.call_llm([{"role": "user", "content": text}], cache=True, role="plan",
+                                    validate=lambda reply: app.extract_json(reply) is not None))
+
+def test_valid_plan_is_served_from_the_cache(app, monkeypatch):
+    called = fake_models(app, monkeypatch, {app.PLAN_MODEL_ID: PLAN})
+
+    assert plan(app, "weather in Pune") == PLAN
+    assert plan(app, "weather in Pune") == PLAN
+    assert called == [app.PLAN_MODEL_ID]
+
+def test_fallback_reply_is_not_cached_under_the_routed_model(app, monkeypatch):
+    called = fake_models(app, monkeypatch, {app.PLAN_MODEL_ID: "not json", app.SYNTHESIS_MODEL_ID: PLAN})
+
+    assert plan(app, "weather in Oslo") == PLAN
+    assert plan(app, "weather in Oslo") == PLAN
+    assert called == [app.PLAN_MODEL_ID, app.SYNTHESIS_MODEL_ID] * 2
+
+def test_lru_eviction_and_expiry(app):
+    cache = app.LLMResponseCache(max_entries=2, ttl=0.05, db_path="")
+    for text in ("a", "b", "c"):
+        cache.put(text, text.upper())
+
+    assert cache.get("a") is None  # least recently used, evicted
+    assert cache.get("c") == "C"
+    time.sleep(0.06)
+    assert cache.get("c") is None
+
+def test_disk_tier_survives_a_new_cache(app, tmp_path):
+    db_path = str(tmp_path / "llm.sqlite")
+    app.LLMResponseCache(db_path=db_path).put("key", "reply")
+
+    cache = app.LLMResponseCache(db_path=db_path)
+
+    assert cache.get("key") == "reply"
+    assert cache.stats["disk_hits"] == 1
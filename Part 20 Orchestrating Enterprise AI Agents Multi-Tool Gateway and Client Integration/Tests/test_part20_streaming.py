@@ -0,0 +1,57 @@
+import asyncio
+
+def failing_turn(app, monkeypatch):
+    """run_agent_async that streams one delta and then fails."""
+    async def run_agent_async(user_text, on_text=None, priority=app.PRIORITY_INTERACTIVE, **kwargs):
+        on_text("Partial")
+        raise RuntimeError("Bedrock unavailable")
+
+    monkeypatch.setattr(app, "run_agent_async", run_agent_async)
+
+def test_flask_stream_ends_with_an_error_event(app, monkeypatch):
+    failing_turn(app, monkeypatch)
+
+    events = list(app.stream_agent("weather in Pune"))
+
+    assert events == [app.sse({"delta": "Partial"}), app.sse({"error": "Bedrock unavailable"})]
+
+def test_agentcore_stream_ends_with_an_error_event(app, monkeypatch):
+    failing_turn(app, monkeypatch)
+
+    async def collect():
+        return [event async for event in app.stream_agent_events("weather in Pune")]
+
+    assert asyncio.run(collect()) == [{"delta": "Partial"}, {"error": "Bedrock unavailable"}]
+
+class FakeConverseStream:
+    """Bedrock client whose converse_stream replays the given events."""
+
+    def __init__(self, events):
+        self._events = events
+
+    async def converse_stream(self, **converse_args):
+        async def stream():
+            for event in self._events:
+                yield event
+        return {"stream": stream()}
+
+def test_converse_stream_forwards_text_and_rebuilds_tool_use(app):
+    bedrock = FakeConverseStream([
+        {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "Checking "}}},
+        {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "Pune."}}},
+        {"contentBlockStart": {"contentBlockIndex": 1,
+                               "start": {"toolUse": {"toolUseId": "t1", "name": "getCityWeather"}}}},
+        {"contentBlockDelta": {"contentBlockIndex": 1, "delta": {"toolUse": {"input": '{"city": '}}}},
+        {"contentBlockDelta": {"contentBlockIndex": 1, "delta": {"toolUse": {"input": '"Pune"}'}}}},
+        {"metadata": {"usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15}}},
+    ])
+    deltas = []
+
+    message, usage = asyncio.run(app.send_converse(bedrock, deltas.append, modelId="m", messages=[]))
+
+    assert deltas == ["Checking ", "Pune."]
+    assert message == {"role": "assistant", "content": [
+        {"text": "Checking Pune."},
+        {"toolUse": {"toolUseId": "t1", "name": "getCityWeather", "input": {"city": "Pune"}}},
+    ]}
+    assert usage["totalTokens"] == 15
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+def slow_fetch(seconds: float, expires_in: int = 3600):
+    """Token endpoint that answers after `seconds`; .calls counts the fetches."""
+    def fetch():
+        fetch.calls += 1
+        time.sleep(seconds)
+        return f"token-{fetch.calls}", expires_in
+    fetch.calls = 0
+    return fetch
+
+def test_concurrent_callers_share_one_fetch(app):
+    fetch = slow_fetch(0.1)
+    refresher = app.TokenRefresher(fetch)
+    tokens = []
+
+    threads = [threading.Thread(target=lambda: tokens.append(refresher.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert tokens == ["token-1"] * 8
+    assert fetch.calls == 1
+    assert refresher.stats["waits"] >= 1
+
+def test_token_is_renewed_inside_the_margin(app):
+    fetch = slow_fetch(0, expires_in=10)
+    refresher = app.TokenRefresher(fetch, margin=10)  # margin is capped at half the lifetime
+
+    assert refresher.get() == "token-1"
+    assert refresher.get() == "token-1"
+    refresher._refresh_at = time.monotonic() - 1  # now inside the margin
+    assert refresher.get() == "token-2"
+    assert fetch.calls == 2
+
+def test_failed_fetch_is_retried_by_the_next_call(app):
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("token endpoint down")
+        return "token", 3600
+
+    refresher = app.TokenRefresher(fetch)
+
+    with pytest.raises(RuntimeError):
+        refresher.get()
+    assert refresher.get() == "token"
+    assert refresher.stats["errors"] == 1
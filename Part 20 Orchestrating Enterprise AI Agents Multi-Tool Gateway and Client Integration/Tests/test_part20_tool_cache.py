@@ -0,0 +1,52 @@
+import time
+
+WEATHER = "myWeatherTool___getCityWeather"
+
+def ok(text: str) -> dict:
+    return {"result": {"content": [{"type": "text", "text": text}], "isError": False}}
+
+def test_canonical_arguments_share_one_entry(app):
+    cache = app.ToolResultCache(ttls={}, default_ttl=60)
+    key = cache.key(WEATHER, {"city": " Chicago ", "units": "F"})
+    cache.put(WEATHER, key, ok("55 F"))
+
+    assert cache.key(WEATHER, {"units": "F", "city": "chicago"}) == key
+    assert cache.get(key) == ok("55 F")
+
+def test_case_sensitive_arguments_keep_their_case(app):
+    cache = app.ToolResultCache(ttls={}, default_ttl=60)
+
+    assert cache.key("Drive___getFile", {"fileId": "1AbC"}) != cache.key("Drive___getFile", {"fileId": "1abc"})
+    assert cache.key("Docs___search", {"text": "Apple  earnings"}) == cache.key("Docs___search", {"text": "Apple earnings"})
+    assert cache.key("Docs___search", {"text": "Apple"}) != cache.key("Docs___search", {"text": "apple"})
+
+def test_errors_are_not_cached(app):
+    cache = app.ToolResultCache(ttls={}, default_ttl=60)
+    key = cache.key(WEATHER, {"city": "Pune"})
+    cache.put(WEATHER, key, {"error": "unavailable"})
+    cache.put(WEATHER, key, {"result": {"content": [], "isError": True}})
+
+    assert cache.get(key) is None
+
+def test_per_tool_ttl_expiry_and_never_cache(app):
+    cache = app.ToolResultCache(ttls={"getCityWeather": 0.05}, default_ttl=60,
+                                never_cache=lambda name: name.startswith("Slack"))
+    key = cache.key(WEATHER, {"city": "Pune"})
+    cache.put(WEATHER, key, ok("31 C"))
+
+    assert cache.get(key) == ok("31 C")
+    time.sleep(0.06)
+    assert cache.get(key) is None
+    assert cache.key("Slack___postMessage", {"text": "hi"}) is None
+
+def test_least_recently_used_entry_is_evicted(app):
+    cache = app.ToolResultCache(ttls={}, default_ttl=60, max_entries=2)
+    keys = [cache.key(WEATHER, {"city": city}) for city in ("Pune", "Oslo", "Lima")]
+    cache.put(WEATHER, keys[0], ok("Pune"))
+    cache.put(WEATHER, keys[1], ok("Oslo"))
+    cache.get(keys[0])
+    cache.put(WEATHER, keys[2], ok("Lima"))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == ok("Pune")
+    assert cache.stats["evictions"] == 1
@@ -0,0 +1,81 @@
+import importlib.util
+import os
+import statistics
+import sys
+import time
+
+# Compares the two Part 20 agent modes on the same questions, against the real
+# gateway and Bedrock:
+#   prompt   - decision prompt with the tool JSON, then Slack and summary prompts
+#   converse - native tool use through Converse toolConfig
+# Reports model calls, input/output tokens, prompt-cache reads and wall time
+# per question. The LLM
+# and tool result caches are switched off so both modes do the full work.
+#
+# Needs the same environment as the agent (GATEWAY_URL, AGENT_SECRET, AWS
+# credentials). The default questions do not post to Slack; Slack questions
+# passed on the command line will.
+#
+#   python benchmodes.py
+#   python benchmodes.py "Get the weather in Chicago and send it to #mylab"
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(HERE, "..", "Agent Code", "app.py")
+MODES = ["prompt", "converse"]
+QUESTIONS = [
+    "Is tomorrow a good day to go sea surfing in Santa Monica?",
+    "What is the current weather in Tokyo?",
+    "Get the coordinates for Madrid, then get the weather for those coordinates",
+    "Tell me a motivational quote",
+]
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("multitool_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.llm_cache = module.LLMResponseCache(max_entries=0, db_path="")
+    module.tool_cache = module.ToolResultCache(ttls={}, default_ttl=0)
+    return module
+
+
+def run_once(app, question, mode):
+    before = dict(app.llm_usage.stats)
+    start = time.perf_counter()
+    app.agent_loop.submit(app.run_agent_async(question, mode=mode)).result()
+    elapsed = time.perf_counter() - start
+    after = app.llm_usage.stats
+    return {
+        "calls": after["calls"] - before["calls"],
+        "input_tokens": after["input_tokens"] - before["input_tokens"],
+        "output_tokens": after["output_tokens"] - before["output_tokens"],
+        "cache_read_tokens": after["cache_read_tokens"] - before["cache_read_tokens"],
+        "seconds": elapsed,
+    }
+
+
+def main():
+    app = load_app()
+    questions = sys.argv[1:] or QUESTIONS
+    app.warm_up()
+
+    print(f"{'question':<48} {'mode':<9} {'calls':>5} {'in tok':>8} {'cached':>8} {'out tok':>8} {'wall s':>7}")
+    totals = {mode: [] for mode in MODES}
+    for question in questions:
+        for mode in MODES:
+            result = run_once(app, question, mode)
+            totals[mode].append(result)
+            print(f"{question[:48]:<48} {mode:<9} {result['calls']:>5} {result['input_tokens']:>8} "
+                  f"{result['cache_read_tokens']:>8} {result['output_tokens']:>8} {result['seconds']:>7.2f}")
+
+    print(f"\n{'mean per question':<48} {'mode':<9} {'calls':>5} {'in tok':>8} {'cached':>8} {'out tok':>8} {'wall s':>7}")
+    for mode, results in totals.items():
+        print(f"{'':<48} {mode:<9} {statistics.mean(r['calls'] for r in results):>5.1f} "
+              f"{statistics.mean(r['input_tokens'] for r in results):>8.0f} "
+              f"{statistics.mean(r['cache_read_tokens'] for r in results):>8.0f} "
+              f"{statistics.mean(r['output_tokens'] for r in results):>8.0f} "
+              f"{statistics.mean(r['seconds'] for r in results):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
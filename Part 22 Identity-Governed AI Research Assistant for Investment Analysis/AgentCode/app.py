@@ -4,9 +4,18 @@ import logging
 import sys
 import base64
 import re
+import functools
+import itertools
+import gzip
 import requests
 import boto3
+import time
+import threading
 from flask import Flask, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from bedrock_agentcore import BedrockAgentCoreApp
 from bedrock_agentcore.services.identity import IdentityClient
 
@@ -26,8 +35,109 @@ GOOGLE_TOKENS_SECRET_ID = os.environ.get("GOOGLE_TOKENS_SECRET_ID")
 AGENT_SECRET = os.environ.get("AGENT_SECRET")
 GATEWAY_URL = os.environ.get("GATEWAY_URL")
 
-bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-secrets = boto3.client("secretsmanager", region_name=AWS_REGION)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
+_aws_clients = {}
+_aws_clients_lock = threading.Lock()
+
+def get_client(service: str):
+    """The shared boto3 client for service, built once under a lock (the default session is not thread-safe)."""
+    client = _aws_clients.get(service)
+    if client is None:
+        with _aws_clients_lock:
+            client = _aws_clients.get(service)
+            if client is None:
+                client = _aws_clients[service] = boto3.client(service, region_name=AWS_REGION,
+                                                              config=AWS_CLIENT_CONFIG)
+    return client
+
+bedrock = get_client("bedrock-runtime")
+secrets = get_client("secretsmanager")
+
+# ----------------------------
+# Secrets Manager Cache
+# ----------------------------
+SECRET_CACHE_TTL = int(os.environ.get("SECRET_CACHE_TTL", "300"))  # seconds before revalidating
+
+class SecretCache:
+    """Parsed Secrets Manager values kept in memory and revalidated by VersionId once the TTL lapses."""
+
+    def __init__(self, client, ttl: int = SECRET_CACHE_TTL):
+        self._client = client
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # secret_id -> {"value", "raw", "version_id", "checked_at"}
+        self.stats = {"hits": 0, "revalidations": 0, "fetches": 0}
+
+    def get(self, secret_id: str, raw: bool = False):
+        """The parsed secret, or with raw=True the SecretString exactly as stored."""
+        with self._lock:
+            entry = self._entries.get(secret_id)
+            if entry and time.monotonic() - entry["checked_at"] < self._ttl:
+                self.stats["hits"] += 1
+                return entry["raw"] if raw else self._copy(entry["value"])
+
+        # TTL lapsed: a DescribeSecret is enough if the current version is unchanged
+        if entry and entry["version_id"] and self._current_version(secret_id) == entry["version_id"]:
+            with self._lock:
+                entry["checked_at"] = time.monotonic()
+                self.stats["revalidations"] += 1
+            return entry["raw"] if raw else self._copy(entry["value"])
+
+        resp = self._client.get_secret_value(SecretId=secret_id)
+        secret_string = resp.get("SecretString", "")
+        try:
+            value = json.loads(secret_string)
+        except json.JSONDecodeError:
+            value = secret_string
+        self._store(secret_id, value, secret_string, resp.get("VersionId"))
+        with self._lock:
+            self.stats["fetches"] += 1
+        return secret_string if raw else self._copy(value)
+
+    def put(self, secret_id: str, value):
+        """Writes a new secret version and keeps the cached copy in step with it."""
+        secret_string = value if isinstance(value, str) else json.dumps(value)
+        resp = self._client.put_secret_value(SecretId=secret_id, SecretString=secret_string)
+        self._store(secret_id, self._copy(value), secret_string, resp.get("VersionId"))
+
+    def _current_version(self, secret_id: str):
+        try:
+            meta = self._client.describe_secret(SecretId=secret_id)
+        except ClientError as e:
+            logger.warning(f"DescribeSecret failed for {secret_id}, refetching value: {e}")
+            return None
+        for version_id, stages in meta.get("VersionIdsToStages", {}).items():
+            if "AWSCURRENT" in stages:
+                return version_id
+        return None
+
+    def _store(self, secret_id: str, value, secret_string: str, version_id: str):
+        with self._lock:
+            self._entries[secret_id] = {
+                "value": value,
+                "raw": secret_string,
+                "version_id": version_id,
+                "checked_at": time.monotonic(),
+            }
+
+    @staticmethod
+    def _copy(value):
+        # Callers may mutate the dict they get back (e.g. before a put)
+        return dict(value) if isinstance(value, dict) else value
+
+secret_cache = SecretCache(secrets)
 
 # ----------------------------
 # Helper: Universal LLM Caller
@@ -40,6 +150,34 @@ def call_llm(messages):
         "max_tokens": 2000,
         "temperature": 0.2
     })
+    return invoke_llm(body)
+
+def call_llm_with_pdf(pdf_base64, prompt: str):
+    """Asks Claude about a PDF given as base64 bytes (or a memoryview of them) without re-encoding it.
+
+    The request JSON is built around a placeholder and the base64 is spliced in, so the
+    only full-size copy made here is the request body itself.
+    """
+    placeholder = "__PDF_BASE64__"
+    body = json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "messages": [{
+            "role": "user",
+            "content": [
+                {
+                    "type": "document",
+                    "source": {"type": "base64", "media_type": "application/pdf", "data": placeholder}
+                },
+                {"type": "text", "text": prompt}
+            ]
+        }],
+        "max_tokens": 2000,
+        "temperature": 0.2
+    }).encode("utf-8")
+    head, tail = body.split(placeholder.encode("ascii"), 1)
+    return invoke_llm(b"".join((head, pdf_base64, tail)))
+
+def invoke_llm(body):
     resp = bedrock.invoke_model(modelId=MODEL_ID, body=body)
     data = json.loads(resp["body"].read())
     # Safely extract text from content list or object
@@ -51,11 +189,90 @@ def call_llm(messages):
 # ----------------------------
 # Token Helpers (Cognito & Google)
 # ----------------------------
+TOKEN_REFRESH_MARGIN = int(os.environ.get("TOKEN_REFRESH_MARGIN", "300"))  # seconds before expiry
 
-def get_oauth_token():
+class TokenRefresher:
+    """Caches one OAuth token until shortly before expiry; concurrent callers share a single refresh.
+
+    get() refreshes on demand. After start(), a background thread also renews the token
+    before it is due, so callers rarely wait on a refresh.
+    """
+
+    def __init__(self, fetch, margin: int = TOKEN_REFRESH_MARGIN):
+        self._fetch = fetch  # () -> (access_token, expires_in)
+        self._margin = margin
+        self._cond = threading.Condition()
+        self._token = None
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._refreshing = False
+        self._thread = None
+        self.stats = {"hits": 0, "refreshes": 0, "waits": 0, "errors": 0}
+
+    def get(self) -> str:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._token and now < self._refresh_at:
+                    self.stats["hits"] += 1
+                    return self._token
+                if not self._refreshing:
+                    self._refreshing = True
+                    break
+                if self._token and now < self._expires_at:
+                    # Still valid while another caller renews it
+                    self.stats["hits"] += 1
+                    return self._token
+                self.stats["waits"] += 1
+                self._cond.wait()
+        return self._do_refresh()
+
+    def _do_refresh(self) -> str:
+        # Caller must have set self._refreshing under the lock
+        try:
+            token, expires_in = self._fetch()
+        except Exception:
+            with self._cond:
+                self.stats["errors"] += 1
+                self._refreshing = False
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            now = time.monotonic()
+            self._token = token
+            self._expires_at = now + expires_in
+            self._refresh_at = self._expires_at - min(self._margin, expires_in // 2)
+            self.stats["refreshes"] += 1
+            self._refreshing = False
+            self._cond.notify_all()
+        logger.info(f"OAuth token refreshed (expires in {expires_in}s)")
+        return token
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="token-refresher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                delay = self._refresh_at - time.monotonic()
+                due = delay <= 0 and not self._refreshing
+                if due:
+                    self._refreshing = True
+            if not due:
+                time.sleep(max(delay, 1))
+                continue
+            try:
+                self._do_refresh()
+            except Exception as e:
+                logger.warning(f"Background token refresh failed: {e}")
+                time.sleep(5)
+
+def fetch_oauth_token():
     """Fetches Cognito JWT to authorize Gateway."""
-    secret_value = secrets.get_secret_value(SecretId=AGENT_SECRET)
-    secret = json.loads(secret_value["SecretString"])
+    secret = secret_cache.get(AGENT_SECRET)
     
     token_url = secret['DOMAIN'].rstrip("/") + "/oauth2/token"
     auth = base64.b64encode(f"{secret['CLIENT_ID']}:{secret['CLIENT_SECRET']}".encode()).decode()
@@ -64,32 +281,41 @@ def get_oauth_token():
 
     response = requests.post(token_url, headers=headers, data=data, timeout=30)
     response.raise_for_status()
-    return response.json()["access_token"]
+    body = response.json()
+    return body["access_token"], int(body.get("expires_in", 3600))
 
-def load_google_identity():
-    """Resolves Google Client ID and Secret ARN from Bedrock AgentCore."""
+gateway_token_refresher = TokenRefresher(fetch_oauth_token)
+
+def get_oauth_token():
+    gateway_token_refresher.start()
+    return gateway_token_refresher.get()
+
+@functools.lru_cache(maxsize=1)
+def load_google_provider():
+    """Resolves Google Client ID and Secret ARN from Bedrock AgentCore (once per process)."""
     identity_client = IdentityClient(AWS_REGION)
     response = identity_client.cp_client.get_oauth2_credential_provider(name=GOOGLE_IDENTITY_NAME)
     
     config = response.get("oauth2ProviderConfigOutput", {}).get("googleOauth2ProviderConfig", {})
-    client_id = config.get("clientId")
-    
     secret_info = response.get("clientSecretArn", {})
-    secret_arn = secret_info.get("secretArn")
+    return config.get("clientId"), secret_info.get("secretArn")
+
+def load_google_identity():
+    """Resolves Google Client ID and Secret; the secret value comes from the secret cache."""
+    client_id, secret_arn = load_google_provider()
     client_secret = None
     
     if secret_arn:
-        s_resp = secrets.get_secret_value(SecretId=secret_arn)
-        raw_val = s_resp.get("SecretString")
-        try:
-            s_json = json.loads(raw_val)
-            client_secret = s_json.get("clientSecret") or s_json.get("client_secret") or raw_val
-        except json.JSONDecodeError:
-            client_secret = raw_val
+        s_val = secret_cache.get(secret_arn)
+        if isinstance(s_val, dict):
+            client_secret = (s_val.get("clientSecret") or s_val.get("client_secret")
+                             or secret_cache.get(secret_arn, raw=True))
+        else:
+            client_secret = s_val
 
     return {"client_id": client_id, "client_secret": client_secret}
 
-def get_fresh_google_token():
+def fetch_google_token():
     def log(msg):
         # sys.stderr + flush ensures the log prints before a crash
         print(f"DEBUG: {msg}", file=sys.stderr, flush=True)
@@ -98,8 +324,7 @@ def get_fresh_google_token():
     
     try:
         # 1. Load your credentials
-        resp = secrets.get_secret_value(SecretId=GOOGLE_TOKENS_SECRET_ID)
-        tokens = json.loads(resp["SecretString"])
+        tokens = secret_cache.get(GOOGLE_TOKENS_SECRET_ID)
         cfg = load_google_identity()
         
         # 2. Build the payload
@@ -110,11 +335,9 @@ def get_fresh_google_token():
             "grant_type": "refresh_token",
         }
 
-        # DEBUG: Print exact payload content
-        # Using repr() will show hidden characters like \n or spaces: 'abc ' vs 'abc'
+        # DEBUG: repr() shows hidden characters like \n or spaces: 'abc ' vs 'abc'.
+        # The client secret and refresh token are never logged.
         log(f"PAYLOAD client_id: {repr(data['client_id'])}")
-        log(f"PAYLOAD client_secret: {repr(data['client_secret'])}")
-        log(f"PAYLOAD refresh_token: {repr(data['refresh_token'])}")
         log(f"PAYLOAD grant_type: {repr(data['grant_type'])}")
 
         # 3. Request (URL MUST end in /token)
@@ -133,19 +356,151 @@ def get_fresh_google_token():
             log(f"!! REASON: {token_resp.text}") # <--- This will show 'invalid_grant' if token is dead
             token_resp.raise_for_status()
         
-        # 5. Success - Save new access token
-        new_token = token_resp.json()["access_token"]
+        # 5. Success - only write back if Google rotated the refresh token
+        token_json = token_resp.json()
+        new_token = token_json["access_token"]
         log("Success! New token received.")
+
+        new_refresh = token_json.get("refresh_token")
+        if new_refresh and new_refresh != tokens.get("refresh_token"):
+            log("Refresh token rotated, updating secret.")
+            tokens["refresh_token"] = new_refresh
+            tokens["access_token"] = new_token
+            secret_cache.put(GOOGLE_TOKENS_SECRET_ID, tokens)
         
-        tokens["access_token"] = new_token
-        secrets.put_secret_value(SecretId=GOOGLE_TOKENS_SECRET_ID, SecretString=json.dumps(tokens))
-        
-        return new_token
+        return new_token, int(token_json.get("expires_in", 3600))
 
     except Exception as e:
         log(f"CRITICAL ERROR: {str(e)}")
         raise
 
+# Access token held in memory until shortly before expiry; refreshed on demand only
+google_token_refresher = TokenRefresher(fetch_google_token)
+
+def get_fresh_google_token():
+    return google_token_refresher.get()
+
+# ----------------------------
+# Gateway Client (pooled, keep-alive)
+# ----------------------------
+GATEWAY_POOL_SIZE = int(os.environ.get("GATEWAY_POOL_SIZE", "10"))
+GATEWAY_TIMEOUT = float(os.environ.get("GATEWAY_TIMEOUT", "30"))  # seconds, per call
+
+GATEWAY_GZIP_MIN_BYTES = int(os.environ.get("GATEWAY_GZIP_MIN_BYTES", "0"))  # gzip request bodies this large; 0 = never
+
+class TransferStats:
+    """Bytes per JSON-RPC method, as decoded JSON and as carried on the wire."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_method = {}
+
+    def record(self, payload, sent: int, sent_wire: int, received: int, received_wire: int):
+        method = payload.get("method") if isinstance(payload, dict) else "batch"
+        with self._lock:
+            totals = self.by_method.setdefault(method, {
+                "calls": 0, "sent_bytes": 0, "sent_wire_bytes": 0,
+                "received_bytes": 0, "received_wire_bytes": 0,
+            })
+            totals["calls"] += 1
+            totals["sent_bytes"] += sent
+            totals["sent_wire_bytes"] += sent_wire
+            totals["received_bytes"] += received
+            totals["received_wire_bytes"] += received_wire
+        logger.debug(f"{method}: sent {sent_wire}/{sent} B, received {received_wire}/{received} B (wire/decoded)")
+
+def encode_body(payload, gzip_min_bytes: int):
+    """JSON request body plus any Content-Encoding header; gzip only pays off on large bodies."""
+    body = json.dumps(payload).encode("utf-8")
+    if gzip_min_bytes and len(body) >= gzip_min_bytes:
+        return body, gzip.compress(body, compresslevel=5), {"Content-Encoding": "gzip"}
+    return body, body, {}
+
+class GatewayClient:
+    """MCP JSON-RPC client for the AgentCore gateway over a pooled keep-alive session."""
+
+    def __init__(self, url: str, token_provider, pool_size: int = GATEWAY_POOL_SIZE,
+                 timeout: float = GATEWAY_TIMEOUT, gzip_min_bytes: int = GATEWAY_GZIP_MIN_BYTES,
+                 transfer: TransferStats = None):
+        self.url = url
+        self._token_provider = token_provider  # () -> bearer token
+        self._timeout = timeout
+        self._ids = itertools.count(1)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            # gzip/deflate, plus br when brotli is installed; urllib3 decodes chunk by chunk
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        self._gzip_min_bytes = gzip_min_bytes
+        self.transfer = transfer or TransferStats()
+
+    def post(self, payload, timeout: float = None) -> requests.Response:
+        body, wire_body, headers = encode_body(payload, self._gzip_min_bytes)
+        headers["Authorization"] = "Bearer " + self._token_provider()
+        response = self._session.post(self.url, headers=headers, data=wire_body,
+                                      timeout=timeout or self._timeout)
+        if response.status_code == 415 and "Content-Encoding" in headers:
+            logger.warning("Gateway does not accept gzip request bodies; sending them uncompressed")
+            self._gzip_min_bytes = 0
+            return self.post(payload, timeout=timeout)
+        # raw.tell() counts the bytes read off the socket, before decompression
+        self.transfer.record(payload, len(body), len(wire_body), len(response.content), response.raw.tell())
+        return response
+
+    def rpc(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def list_tools(self, timeout: float = None) -> list:
+        return self.rpc("tools/list", timeout=timeout).get("result", {}).get("tools", [])
+
+    def call_tool(self, name: str, arguments: dict, timeout: float = None) -> dict:
+        return self.rpc("tools/call", {"name": name, "arguments": arguments}, timeout=timeout)
+
+    def call_tool_raw(self, name: str, arguments: dict, timeout: float = None) -> bytes:
+        """tools/call returning the undecoded response body, for large payloads."""
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": "tools/call",
+                   "params": {"name": name, "arguments": arguments}}
+        response = self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+gateway = GatewayClient(GATEWAY_URL, get_oauth_token)
+
+# ----------------------------
+# PDF Payload Extraction
+# ----------------------------
+# The Drive Lambda's JSON arrives as an escaped string inside the tools/call result:
+#   ..."text": "{\"file_name\": \"x.pdf\", \"file_base64\": \"JVBERi0...\"}"...
+# Base64 needs no JSON escaping, so the value can be located in the raw bytes.
+FILE_BASE64_RE = re.compile(rb'\\?"file_base64\\?"\s*:\s*\\?"([A-Za-z0-9+/=]*)\\?"')
+
+def extract_file_base64(raw: bytes):
+    """Returns the file_base64 value as a zero-copy memoryview into `raw`, or None.
+
+    Falls back to a full JSON parse if the value is not a plain base64 run (e.g. a
+    gateway that escapes "/" as "\\/").
+    """
+    match = FILE_BASE64_RE.search(raw)
+    if match and (match.end(1) - match.start(1)) % 4 == 0:
+        return memoryview(raw)[match.start(1):match.end(1)]
+
+    content_list = json.loads(raw).get("result", {}).get("content", [])
+    for item in content_list:
+        if "file_base64" in item.get("text", ""):
+            return json.loads(item["text"])["file_base64"].encode("ascii")
+    return None
+
 # ----------------------------
 # Core Agent Logic
 # ----------------------------
@@ -164,55 +519,46 @@ def run_agent(user_text: str):
     file_name = match.group(1)
     logger.info(f"PDF detected: {file_name}. Initiating Identity flow.")
 
-    gateway_jwt = get_oauth_token()
     google_token = get_fresh_google_token()
 
     target_tool = "myForecastAnalyst___myGoogleDriveTool" #REPLACE WITH YOUR TOOL NAME
-    payload = {
-        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
-        "params": {
-            "name": target_tool,
-            "arguments": {"file_name": file_name, "access_token": google_token}
-        }
-    }
-
-    headers = {"Authorization": f"Bearer {gateway_jwt}", "Content-Type": "application/json"}
-    resp = requests.post(GATEWAY_URL, headers=headers, json=payload, timeout=60)
-    resp.raise_for_status()
-    tool_resp = resp.json()
+    tool_raw = gateway.call_tool_raw(
+        target_tool,
+        {"file_name": file_name, "access_token": google_token},
+        timeout=60
+    )
 
     # 4. Extract PDF and Analyze
+    # The base64 goes to Bedrock as received: no decode / re-encode round trip
     try:
-        content_list = tool_resp.get("result", {}).get("content", [])
-        pdf_b64 = None
-        for item in content_list:
-            if "file_base64" in item.get("text", ""):
-                pdf_b64 = json.loads(item["text"])["file_base64"]
-                break
-        
+        pdf_b64 = extract_file_base64(tool_raw)
         if not pdf_b64:
-            return f"Error: Tool did not return PDF. Response: {tool_resp}"
-        
-        pdf_bytes = base64.b64decode(pdf_b64)
+            return f"Error: Tool did not return PDF. Response: {tool_raw[:2000].decode('utf-8', 'replace')}"
     except Exception as e:
         return f"Failed to parse tool output: {e}"
 
     # Multimodal Summary with Claude 4.5
-    messages = [{
-        "role": "user",
-        "content": [
-            {
-                "type": "document", 
-                "source": {
-                    "type": "base64", 
-                    "media_type": "application/pdf", 
-                    "data": base64.b64encode(pdf_bytes).decode()
-                }
-            },
-            {"type": "text", "text": f"Summarize this earnings PDF: {user_text}"}
-        ]
-    }]
-    return call_llm(messages)
+    return call_llm_with_pdf(pdf_b64, f"Summarize this earnings PDF: {user_text}")
+
+# ----------------------------
+# Startup Warm-up
+# ----------------------------
+WARMUP_ON_START = os.environ.get("WARMUP_ON_START", "true").lower() == "true"
+warmup_done = threading.Event()
+warmup_done.set()  # cleared only while a start-up warm-up runs
+
+def warm_up():
+    """Primes the Cognito and Google tokens and the gateway connection before the first PDF request."""
+    start = time.monotonic()
+    try:
+        get_oauth_token()         # Secrets Manager + Cognito
+        get_fresh_google_token()  # IdentityClient, provider config, Google token endpoint
+        gateway.list_tools()      # gateway DNS/TLS, kept in the pool
+    except Exception as e:
+        logger.warning(f"Warm-up incomplete, continuing lazily: {e}")
+    finally:
+        warmup_done.set()
+        logger.info(f"Warm-up finished in {time.monotonic() - start:.2f}s")
 
 # ----------------------------
 # Flask App Routes
@@ -229,9 +575,23 @@ def invocations():
         logger.exception("Agent failed")
         return jsonify({"error": str(e)}), 500
 
+@flask_app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({
+        "secrets": secret_cache.stats,
+        "gateway_token": gateway_token_refresher.stats,
+        "google_token": google_token_refresher.stats,
+        "gateway_transfer": gateway.transfer.by_method
+    }), 200
+
 @flask_app.route("/ping", methods=["GET"])
 def ping():
+    if not warmup_done.is_set():
+        return jsonify({"status": "HealthyBusy"}), 200  # as the AgentCore ping reports it
     return jsonify({"status": "ok"}), 200
 
 if __name__ == "__main__":
+    if WARMUP_ON_START:
+        warmup_done.clear()
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
     flask_app.run(host="0.0.0.0", port=8080)
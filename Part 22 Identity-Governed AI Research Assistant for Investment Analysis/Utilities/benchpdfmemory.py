@@ -0,0 +1,117 @@
+import base64
+import glob
+import importlib.util
+import json
+import os
+import sys
+import tracemalloc
+
+import boto3
+
+# Measures peak Python memory (tracemalloc) for the PDF path in run_agent: from the raw
+# tools/call response bytes to the Bedrock request body. Compares the old
+# parse / decode / re-encode path with the pass-through in app.py.
+#
+#   python benchpdfmemory.py                 # PDFs in ../Reports plus a synthetic 8 MB file
+#   python benchpdfmemory.py report.pdf ...
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(HERE, "..", "AgentCode", "app.py")
+REPORTS = sorted(glob.glob(os.path.join(HERE, "..", "Reports", "*.pdf")))
+SYNTHETIC_MB = 8
+PROMPT = "Summarize this earnings PDF: How did the quarter go?"
+
+
+def load_app():
+    """Imports app.py with stand-in AWS clients; nothing is called over the network."""
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    real_client = boto3.client
+    boto3.client = lambda service, **kwargs: None
+    try:
+        spec = importlib.util.spec_from_file_location("research_app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        boto3.client = real_client
+    return module
+
+
+def gateway_response(pdf_bytes):
+    """A tools/call response shaped like the gateway's wrapping of the Drive Lambda result."""
+    tool_result = {"file_name": "report.pdf", "file_base64": base64.b64encode(pdf_bytes).decode("utf-8")}
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {"content": [{"type": "text", "text": json.dumps(tool_result)}], "isError": False}
+    }).encode("utf-8")
+
+
+def old_path(raw):
+    tool_resp = json.loads(raw)
+    pdf_b64 = None
+    for item in tool_resp.get("result", {}).get("content", []):
+        if "file_base64" in item.get("text", ""):
+            pdf_b64 = json.loads(item["text"])["file_base64"]
+            break
+    pdf_bytes = base64.b64decode(pdf_b64)
+    messages = [{
+        "role": "user",
+        "content": [
+            {
+                "type": "document",
+                "source": {"type": "base64", "media_type": "application/pdf",
+                           "data": base64.b64encode(pdf_bytes).decode()}
+            },
+            {"type": "text", "text": PROMPT}
+        ]
+    }]
+    return json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "messages": messages,
+        "max_tokens": 2000,
+        "temperature": 0.2
+    }).encode("utf-8")
+
+
+def new_path(app, raw):
+    captured = {}
+    app.invoke_llm = lambda body: captured.setdefault("body", body)
+    app.call_llm_with_pdf(app.extract_file_base64(raw), PROMPT)
+    return captured["body"]
+
+
+def peak_mb(fn, *args):
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak / (1024 * 1024)
+
+
+def run_case(app, name, pdf_bytes):
+    raw = gateway_response(pdf_bytes)
+    old_body, old_peak = peak_mb(old_path, raw)
+    new_body, new_peak = peak_mb(new_path, app, raw)
+    if json.loads(old_body) != json.loads(new_body):
+        raise RuntimeError(f"{name}: request bodies differ")
+    print(f"{name:<44} {len(pdf_bytes) / 1048576:>8.2f} {len(raw) / 1048576:>9.2f} "
+          f"{old_peak:>9.2f} {new_peak:>9.2f} {old_peak / new_peak:>7.1f}x")
+
+
+def main():
+    app = load_app()
+    paths = sys.argv[1:] or REPORTS
+
+    print("Peak traced memory (MB) above the raw tools/call response, per request\n")
+    print(f"{'PDF':<44} {'pdf MB':>8} {'resp MB':>9} {'old peak':>9} {'new peak':>9} {'ratio':>8}")
+    for path in paths:
+        with open(path, "rb") as f:
+            run_case(app, os.path.basename(path)[:44], f.read())
+    if not sys.argv[1:]:
+        run_case(app, f"synthetic {SYNTHETIC_MB} MB", os.urandom(SYNTHETIC_MB * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 import os
 import json
 import logging
+import time
+import heapq
+import itertools
+import contextvars
+import queue
+import threading
 import boto3
-from flask import Flask, request, jsonify
+from botocore.config import Config
+from flask import Flask, Response, request, jsonify
 from bedrock_agentcore.tools.code_interpreter_client import CodeInterpreter
 
 # -------------------------------------------------
@@ -22,7 +29,19 @@ AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 # Using Claude 4.5 Global Inference Profile
 MODEL_ID = os.environ.get("MODEL_ID", "global.anthropic.claude-sonnet-4-5-20250929-v1:0")
 
-bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
 code_client = CodeInterpreter(AWS_REGION)
 
 # -------------------------------------------------
@@ -45,30 +64,237 @@ CODE_INTERPRETER_TOOL = {
     }
 }
 
+# -------------------------------------------------
+# Bedrock Rate Limiter
+# -------------------------------------------------
+BEDROCK_RPM = int(os.environ.get("BEDROCK_RPM", "0"))  # model requests per minute for this process; 0 = no limit
+BEDROCK_TPM = int(os.environ.get("BEDROCK_TPM", "0"))  # input + output tokens per minute; 0 = no limit
+BEDROCK_REPLY_TOKENS = 4096  # reserved for the reply when a request sets no max tokens
+
+PRIORITY_INTERACTIVE = 0  # someone is waiting on the answer
+PRIORITY_BACKGROUND = 1   # batch, evaluation or summarisation runs; served when no interactive call waits
+PRIORITIES = {"interactive": PRIORITY_INTERACTIVE, "background": PRIORITY_BACKGROUND}
+
+THROTTLE_CODES = frozenset({"ThrottlingException", "TooManyRequestsException"})
+
+# Priority class of the model calls made by the current request
+bedrock_priority = contextvars.ContextVar("bedrock_priority", default=PRIORITY_INTERACTIVE)
+
+def request_priority(payload: dict) -> int:
+    """{"priority": "background"} in a request payload queues its model calls behind interactive ones."""
+    return PRIORITIES.get(payload.get("priority"), PRIORITY_INTERACTIVE)
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English and JSON; close enough for budgeting
+    return (len(text) + 3) // 4
+
+class BedrockRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets in front of every Bedrock call in the
+    process, so excess calls queue here instead of spending the service quota on throttled
+    attempts. Waiting calls go in priority order, then arrival order. Tokens are reserved
+    up front (prompt estimate + max reply) and settled with the real count afterwards.
+    Rates adapt AIMD-style: a throttling response (including ones the client retries on
+    its own) halves them, each completed call wins back a small step.
+    """
+
+    DECREASE = 0.5       # rate factor after a throttle
+    INCREASE = 0.05      # added back per completed call, up to the configured rates
+    MIN_SCALE = 0.1
+    DECREASE_GAP = 1.0   # seconds; throttles from calls already in flight count once
+
+    def __init__(self, rpm: int = BEDROCK_RPM, tpm: int = BEDROCK_TPM):
+        self._rpm, self._tpm = rpm, tpm
+        self._scale = 1.0
+        self._requests, self._tokens = float(rpm), float(tpm)  # buckets start full
+        self._refilled = time.monotonic()
+        self._decreased = 0.0
+        self._waiting = []  # heap of (priority, arrival) tickets
+        self._arrivals = itertools.count()
+        self._cond = threading.Condition()
+        self.stats = {"calls": 0, "waits": 0, "wait_ms": 0, "background_calls": 0,
+                      "throttles": 0, "rate_scale": 1.0}
+
+    def acquire(self, tokens: int) -> int:
+        """Blocks until this call may go; returns the tokens reserved, to pass to release()."""
+        ticket = (bedrock_priority.get(), next(self._arrivals))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while (delay := self._delay(ticket, tokens)) != 0:
+                    self._cond.wait(delay)
+                reserved = self._take(tokens)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            self._waited(ticket[0], time.monotonic() - start)
+        return reserved
+
+    def release(self, reserved: int, used_tokens: int = None):
+        """Settles the reservation once the call ends; used_tokens is None if it failed."""
+        with self._cond:
+            self._settle(reserved, used_tokens)
+            self._cond.notify_all()
+
+    def on_attempt(self, response=None, **kwargs):
+        """botocore needs-retry hook: sees every attempt, including the client's own retries."""
+        if response is not None and response[1].get("Error", {}).get("Code") in THROTTLE_CODES:
+            with self._cond:
+                self.throttled()
+        # None leaves the retry decision to botocore's own handler
+
+    def throttled(self):
+        now = time.monotonic()
+        self.stats["throttles"] += 1
+        if now - self._decreased < self.DECREASE_GAP:
+            return
+        self._decreased = now
+        self._refill()
+        self._scale = max(self.MIN_SCALE, self._scale * self.DECREASE)
+        # Start the lower rate from empty buckets, so the next calls are spaced out at once
+        self._requests, self._tokens = min(self._requests, 0.0), min(self._tokens, 0.0)
+        self.stats["rate_scale"] = round(self._scale, 3)
+        logger.warning(f"Bedrock throttled; request and token rates cut to {self._scale:.0%}")
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._refilled = now - self._refilled, now
+        if self._rpm:
+            rate = self._rpm * self._scale
+            self._requests = min(rate, self._requests + elapsed * rate / 60)
+        if self._tpm:
+            rate = self._tpm * self._scale
+            self._tokens = min(rate, self._tokens + elapsed * rate / 60)
+
+    def _delay(self, ticket, tokens: int):
+        """0 if ticket may go now, else seconds until the buckets allow it (None: not its turn yet)."""
+        if self._waiting[0] != ticket:
+            return None
+        self._refill()
+        delay = 0.0
+        if self._rpm and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60 / (self._rpm * self._scale))
+        if self._tpm:
+            # A request larger than a minute's budget goes once the bucket is full
+            need = min(tokens, self._tpm * self._scale)
+            if self._tokens < need:
+                delay = max(delay, (need - self._tokens) * 60 / (self._tpm * self._scale))
+        return delay
+
+    def _take(self, tokens: int) -> int:
+        reserved = min(tokens, int(self._tpm * self._scale)) if self._tpm else 0
+        if self._rpm:
+            self._requests -= 1
+        self._tokens -= reserved
+        return reserved
+
+    def _settle(self, reserved: int, used_tokens: int):
+        if used_tokens is None:
+            # A failed or throttled call consumed no tokens: give the whole reservation back
+            if self._tpm:
+                self._tokens = min(self._tpm * self._scale, self._tokens + reserved)
+            return
+        if self._tpm:
+            self._tokens += reserved - used_tokens  # refund the unused part, or charge the overrun
+        self._scale = min(1.0, self._scale + self.INCREASE)
+        self.stats["rate_scale"] = round(self._scale, 3)
+
+    def _waited(self, priority: int, seconds: float):
+        self.stats["calls"] += 1
+        if priority != PRIORITY_INTERACTIVE:
+            self.stats["background_calls"] += 1
+        if seconds >= 0.01:
+            self.stats["waits"] += 1
+            self.stats["wait_ms"] += round(seconds * 1000)
+            logger.info(f"Bedrock call waited {seconds * 1000:.0f} ms for rate limit capacity")
+
+bedrock_limiter = BedrockRateLimiter()
+
+# With a rate limit set, the limiter alone reacts to throttling; adaptive retries would add
+# botocore's own client-side rate limiter as a second feedback loop on the same signal
+BEDROCK_CLIENT_CONFIG = (
+    AWS_CLIENT_CONFIG.merge(Config(retries={"mode": "standard", "total_max_attempts": AWS_MAX_ATTEMPTS}))
+    if BEDROCK_RPM or BEDROCK_TPM else AWS_CLIENT_CONFIG
+)
+bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION, config=BEDROCK_CLIENT_CONFIG)
+
+# First, so the limiter sees throttled attempts before the retry handler acts on them
+bedrock.meta.events.register_first("needs-retry.bedrock-runtime", bedrock_limiter.on_attempt)
+
 # -------------------------------------------------
 # LLM Caller
 # -------------------------------------------------
-def call_llm(messages):
-    """Calls Bedrock using the Converse API"""
-    response = bedrock.converse(
+def converse_message(on_text=None, **kwargs):
+    """
+    The assistant message from Converse. With on_text, the reply comes from converse_stream
+    and each text piece is passed to on_text as it arrives; tool-use blocks are reassembled
+    so the loop sees the same message either way. Each call first waits its turn at bedrock_limiter.
+    """
+    reply_tokens = kwargs.get("inferenceConfig", {}).get("maxTokens", BEDROCK_REPLY_TOKENS)
+    reserved = bedrock_limiter.acquire(estimate_tokens(json.dumps(kwargs, default=str)) + reply_tokens)
+    usage = None
+    try:
+        message, usage = send_converse(on_text, **kwargs)
+    finally:
+        bedrock_limiter.release(reserved, None if usage is None else usage.get("totalTokens", 0))
+    return message
+
+def send_converse(on_text=None, **kwargs):
+    """(assistant message, token usage) of one Converse call; see converse_message."""
+    if not on_text:
+        response = bedrock.converse(**kwargs)
+        return response["output"]["message"], response.get("usage", {})
+
+    blocks = {}  # contentBlockIndex -> content block
+    usage = {}
+    for event in bedrock.converse_stream(**kwargs)["stream"]:
+        if "contentBlockStart" in event:
+            start = event["contentBlockStart"]
+            if "toolUse" in start["start"]:
+                blocks[start["contentBlockIndex"]] = {"toolUse": {**start["start"]["toolUse"], "input": ""}}
+        elif "contentBlockDelta" in event:
+            delta = event["contentBlockDelta"]
+            block = blocks.setdefault(delta["contentBlockIndex"], {"text": ""})
+            if "text" in delta["delta"]:
+                block["text"] += delta["delta"]["text"]
+                on_text(delta["delta"]["text"])
+            elif "toolUse" in delta["delta"]:
+                block["toolUse"]["input"] += delta["delta"]["toolUse"]["input"]
+        elif "metadata" in event:
+            usage = event["metadata"].get("usage", {})
+
+    content = []
+    for index in sorted(blocks):
+        block = blocks[index]
+        if "toolUse" in block:
+            block["toolUse"]["input"] = json.loads(block["toolUse"]["input"] or "{}")
+        content.append(block)
+    return {"role": "assistant", "content": content}, usage
+
+def call_llm(messages, on_text=None):
+    """Calls Bedrock using the Converse API (streamed when on_text is given)"""
+    return converse_message(
+        on_text,
         modelId=MODEL_ID,
         messages=messages,
         inferenceConfig={"maxTokens": 2000, "temperature": 0.2},
         toolConfig={"tools": [CODE_INTERPRETER_TOOL]}
     )
-    return response["output"]["message"]
 
 # -------------------------------------------------
 # Multi-step Tool Routing Loop
 # -------------------------------------------------
-def run_agent(user_text: str):
+def run_agent(user_text: str, on_text=None, priority: int = PRIORITY_INTERACTIVE):
+    bedrock_priority.set(priority)
     messages = [{"role": "user", "content": [{"text": user_text}]}]
     is_session_active = False
 
     try:
         while True:
             # 1. Get LLM Response
-            assistant_message = call_llm(messages)
+            assistant_message = call_llm(messages, on_text)
             messages.append(assistant_message)
 
             # 2. Check for Tool Use
@@ -133,13 +359,41 @@ def run_agent(user_text: str):
 # -------------------------------------------------
 # Flask Routes
 # -------------------------------------------------
+def sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+def stream_agent(user_text, priority: int = PRIORITY_INTERACTIVE):
+    """
+    SSE events: {"delta": ...} for each piece of model text (including any narration
+    before a tool call), then the same completion the JSON mode returns.
+    """
+    events = queue.Queue()
+
+    def run():
+        try:
+            completion = run_agent(user_text, on_text=lambda text: events.put({"delta": text}), priority=priority)
+            events.put({"completion": completion, "stop_reason": "end_turn"})
+        except Exception as e:
+            logger.exception("Agent execution failed")
+            events.put({"error": str(e)})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, name="agent-stream", daemon=True).start()
+    while (event := events.get()) is not None:
+        yield sse(event)
+
 @flask_app.route("/invocations", methods=["POST"])
 def invocations():
     data = request.get_json() or {}
     user_input = data.get("input", {}).get("text", data.get("text", ""))
+    priority = request_priority(data)
+    if data.get("stream") or "text/event-stream" in request.headers.get("Accept", ""):
+        return Response(stream_agent(user_input, priority), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"})
 
     try:
-        completion = run_agent(user_input)
+        completion = run_agent(user_input, priority=priority)
         return jsonify({"completion": completion, "stop_reason": "end_turn"}), 200
     except Exception as e:
         logger.exception("Agent execution failed")
@@ -0,0 +1,20 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "AgentCode" / "app.py"
+
+@pytest.fixture(scope="session")
+def app():
+    """The agent module, loaded from its file without starting the server."""
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    name = "part24_app"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
@@ -0,0 +1,43 @@
+import threading
+import time
+
+def test_failed_call_gives_its_token_reservation_back(app):
+    limiter = app.BedrockRateLimiter(rpm=0, tpm=6000)
+
+    limiter.release(limiter.acquire(5000))  # the call failed
+    start = time.monotonic()
+    reserved = limiter.acquire(5000)  # ~50 s away if the first reservation were kept
+
+    assert reserved == 5000
+    assert time.monotonic() - start < 0.1
+
+def test_throttled_attempt_cuts_the_rate(app):
+    limiter = app.BedrockRateLimiter(rpm=600, tpm=0)
+    throttled = ({}, {"Error": {"Code": "ThrottlingException"}})
+
+    limiter.on_attempt(response=throttled)
+    limiter.on_attempt(response=({}, {}))  # a successful attempt changes nothing
+
+    assert limiter.stats["throttles"] == 1
+    assert limiter.stats["rate_scale"] == limiter.DECREASE
+
+def test_interactive_calls_go_before_waiting_background_calls(app):
+    limiter = app.BedrockRateLimiter(rpm=120, tpm=0)  # one request every 0.5 s once the bucket is empty
+    order = []
+
+    def call(priority, label):
+        app.bedrock_priority.set(priority)
+        limiter.acquire(0)
+        order.append(label)
+
+    for _ in range(120):
+        limiter.acquire(0)  # empty the bucket
+    threads = []
+    for priority, label in ((app.PRIORITY_BACKGROUND, "background"), (app.PRIORITY_INTERACTIVE, "interactive")):
+        threads.append(threading.Thread(target=call, args=(priority, label)))
+        threads[-1].start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["interactive", "background"]
@@ -1,7 +1,11 @@
 import os
+import json
 import logging
+import queue
+import threading
 import boto3
-from flask import Flask, request, jsonify
+from botocore.config import Config
+from flask import Flask, Response, request, jsonify
 from werkzeug.serving import WSGIRequestHandler
 
 # 1. Silence Flask/Health-check spam
@@ -17,8 +21,35 @@ logger = logging.getLogger(__name__)
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 MODEL_ID = os.environ.get("MODEL_ID", "anthropic.claude-3-5-sonnet-20240620-v1:0") #global.anthropic.claude-sonnet-4-5-20250929-v1:0
 
-agentcore = boto3.client("bedrock-agentcore", region_name=AWS_REGION)
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
+_aws_clients = {}
+_aws_clients_lock = threading.Lock()
+
+def get_client(service: str):
+    """The shared boto3 client for service, built once under a lock (the default session is not thread-safe)."""
+    client = _aws_clients.get(service)
+    if client is None:
+        with _aws_clients_lock:
+            client = _aws_clients.get(service)
+            if client is None:
+                client = _aws_clients[service] = boto3.client(service, region_name=AWS_REGION,
+                                                              config=AWS_CLIENT_CONFIG)
+    return client
+
+agentcore = get_client("bedrock-agentcore")
+bedrock_runtime = get_client("bedrock-runtime")
 
 # 4. Managed Browser Identifier
 BROWSER_ID = "aws.browser.v1"
@@ -44,20 +75,52 @@ BROWSER_TOOL_SPEC = {
     }
 }
 
-def run_agent(user_text: str):
+def converse_message(on_text=None, **kwargs):
+    """
+    The assistant message from Converse. With on_text, the reply comes from converse_stream
+    and each text piece is passed to on_text as it arrives; tool-use blocks are reassembled
+    so the loop sees the same message either way.
+    """
+    if not on_text:
+        return bedrock_runtime.converse(**kwargs)["output"]["message"]
+
+    blocks = {}  # contentBlockIndex -> content block
+    for event in bedrock_runtime.converse_stream(**kwargs)["stream"]:
+        if "contentBlockStart" in event:
+            start = event["contentBlockStart"]
+            if "toolUse" in start["start"]:
+                blocks[start["contentBlockIndex"]] = {"toolUse": {**start["start"]["toolUse"], "input": ""}}
+        elif "contentBlockDelta" in event:
+            delta = event["contentBlockDelta"]
+            block = blocks.setdefault(delta["contentBlockIndex"], {"text": ""})
+            if "text" in delta["delta"]:
+                block["text"] += delta["delta"]["text"]
+                on_text(delta["delta"]["text"])
+            elif "toolUse" in delta["delta"]:
+                block["toolUse"]["input"] += delta["delta"]["toolUse"]["input"]
+
+    content = []
+    for index in sorted(blocks):
+        block = blocks[index]
+        if "toolUse" in block:
+            block["toolUse"]["input"] = json.loads(block["toolUse"]["input"] or "{}")
+        content.append(block)
+    return {"role": "assistant", "content": content}
+
+def run_agent(user_text: str, on_text=None):
     messages = [{"role": "user", "content": [{"text": user_text}]}]
     session_id = None
 
     try:
         while True:
-            response = bedrock_runtime.converse(
+            assistant_msg = converse_message(
+                on_text,
                 modelId=MODEL_ID,
                 messages=messages,
                 system=[{"text": SYSTEM_PROMPT}],
                 toolConfig={"tools": [BROWSER_TOOL_SPEC]}
             )
             
-            assistant_msg = response["output"]["message"]
             messages.append(assistant_msg)
 
             tool_requests = [c["toolUse"] for c in assistant_msg["content"] if "toolUse" in c]
@@ -124,10 +187,37 @@ def run_agent(user_text: str):
             except Exception as stop_err:
                 logger.warning(f"Error closing session: {stop_err}")
 
+def sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+def stream_agent(user_text):
+    """
+    SSE events: {"delta": ...} for each piece of model text (including any narration
+    before a tool call), then the same completion the JSON mode returns.
+    """
+    events = queue.Queue()
+
+    def run():
+        try:
+            completion = run_agent(user_text, on_text=lambda text: events.put({"delta": text}))
+            events.put({"completion": completion})
+        except Exception as e:
+            logger.exception("Agent execution failed")
+            events.put({"error": str(e)})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, name="agent-stream", daemon=True).start()
+    while (event := events.get()) is not None:
+        yield sse(event)
+
 @flask_app.route("/invocations", methods=["POST"])
 def invocations():
     data = request.get_json() or {}
     user_input = data.get("text", data.get("input", {}).get("text", ""))
+    if data.get("stream") or "text/event-stream" in request.headers.get("Accept", ""):
+        return Response(stream_agent(user_input), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"})
     return jsonify({"completion": run_agent(user_input)}), 200
 
 @flask_app.route("/ping", methods=["GET"])
@@ -6,6 +6,7 @@ import json
 from flask import Flask, request, jsonify
 from playwright.async_api import async_playwright
 import boto3
+from botocore.config import Config
 
 # ----------------------
 # Logging
@@ -24,7 +25,21 @@ app = Flask(__name__, static_folder="static")
 # ----------------------
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 MODEL_ID = os.environ.get("MODEL_ID", "global.anthropic.claude-sonnet-4-5-20250929-v1:0")
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
+bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION, config=AWS_CLIENT_CONFIG)
 
 SYSTEM_PROMPT = """
 You are a helpful assistant. Decide if a tool call is needed.
@@ -1,7 +1,9 @@
 import os
 import uuid
 import logging
+import threading
 import boto3
+from botocore.config import Config
 from flask import Flask, request, jsonify
 from werkzeug.serving import WSGIRequestHandler
 
@@ -24,8 +26,35 @@ logger = logging.getLogger(__name__)
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 MODEL_ID = os.environ.get("MODEL_ID", "global.anthropic.claude-sonnet-4-5-20250929-v1:0")
 
-agentcore = boto3.client("bedrock-agentcore", region_name=AWS_REGION)
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+
+_aws_clients = {}
+_aws_clients_lock = threading.Lock()
+
+def get_client(service: str):
+    """The shared boto3 client for service, built once under a lock (the default session is not thread-safe)."""
+    client = _aws_clients.get(service)
+    if client is None:
+        with _aws_clients_lock:
+            client = _aws_clients.get(service)
+            if client is None:
+                client = _aws_clients[service] = boto3.client(service, region_name=AWS_REGION,
+                                                              config=AWS_CLIENT_CONFIG)
+    return client
+
+agentcore = get_client("bedrock-agentcore")
+bedrock_runtime = get_client("bedrock-runtime")
 
 # 4. Managed Browser Identifier
 BROWSER_ID = "aws.browser.v1"
@@ -2,13 +2,32 @@ import os
 import json
 import logging
 import base64
+import itertools
+import hashlib
+import sqlite3
+import gzip
+import random
+from collections import OrderedDict, deque
 import requests
 import boto3
 import uuid
-from flask import Flask, request, jsonify
+import time
+import heapq
+import contextvars
+import asyncio
+import threading
+import queue
+import httpx
+from flask import Flask, Response, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from aiobotocore.session import get_session
+from aiobotocore.config import AioConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from typing import TypedDict, List, Dict, Any, Annotated
 from opentelemetry.instrumentation.langchain import LangchainInstrumentor
-from bedrock_agentcore import BedrockAgentCoreApp
+from bedrock_agentcore import BedrockAgentCoreApp, PingStatus
 
 # --------------------------------------------------
 # LangGraph imports
@@ -16,6 +35,7 @@ from bedrock_agentcore import BedrockAgentCoreApp
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+from langchain_core.runnables import RunnableConfig
 
 # --------------------------------------------------
 # CRITICAL: Enable LangChain instrumentation
@@ -50,9 +70,96 @@ AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 GATEWAY_URL = os.environ.get("GATEWAY_URL")
 AGENT_SECRET = os.environ.get("AGENT_SECRET")
 MODEL_ID = "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
+PLAN_MODEL_ID = os.environ.get("PLAN_MODEL_ID", "global.anthropic.claude-haiku-4-5-20251001-v1:0")  # JSON-only tool plans
+SYNTHESIS_MODEL_ID = os.environ.get("SYNTHESIS_MODEL_ID", MODEL_ID)  # user-facing answers and Slack messages
+PROMPT_CACHE = os.environ.get("PROMPT_CACHE", "true").lower() == "true"  # Bedrock prompt-cache checkpoint on static prefixes
 
-bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-secrets = boto3.client("secretsmanager", region_name=AWS_REGION)
+# --------------------------------------------------
+# AWS Clients
+# --------------------------------------------------
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))  # pooled connections per client
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))  # seconds
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "120"))  # seconds without response bytes
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))  # per call, first try included
+
+# Shared by the boto3 Secrets Manager client and the aiobotocore Bedrock client
+AWS_CLIENT_SETTINGS = dict(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT,
+    read_timeout=AWS_READ_TIMEOUT,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+AWS_CLIENT_CONFIG = Config(**AWS_CLIENT_SETTINGS)
+AWS_ASYNC_CLIENT_CONFIG = AioConfig(**AWS_CLIENT_SETTINGS)
+
+secrets = boto3.client("secretsmanager", region_name=AWS_REGION, config=AWS_CLIENT_CONFIG)
+
+# --------------------------------------------------
+# Secrets Manager Cache
+# --------------------------------------------------
+SECRET_CACHE_TTL = int(os.environ.get("SECRET_CACHE_TTL", "300"))  # seconds before revalidating
+
+class SecretCache:
+    """Parsed Secrets Manager values kept in memory and revalidated by VersionId once the TTL lapses."""
+
+    def __init__(self, client, ttl: int = SECRET_CACHE_TTL):
+        self._client = client
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # secret_id -> {"value", "version_id", "checked_at"}
+        self.stats = {"hits": 0, "revalidations": 0, "fetches": 0}
+
+    def get(self, secret_id: str):
+        with self._lock:
+            entry = self._entries.get(secret_id)
+            if entry and time.monotonic() - entry["checked_at"] < self._ttl:
+                self.stats["hits"] += 1
+                return self._copy(entry["value"])
+
+        # TTL lapsed: a DescribeSecret is enough if the current version is unchanged
+        if entry and entry["version_id"] and self._current_version(secret_id) == entry["version_id"]:
+            with self._lock:
+                entry["checked_at"] = time.monotonic()
+                self.stats["revalidations"] += 1
+            return self._copy(entry["value"])
+
+        resp = self._client.get_secret_value(SecretId=secret_id)
+        raw = resp.get("SecretString", "")
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw
+        self._store(secret_id, value, resp.get("VersionId"))
+        with self._lock:
+            self.stats["fetches"] += 1
+        return self._copy(value)
+
+    def _current_version(self, secret_id: str):
+        try:
+            meta = self._client.describe_secret(SecretId=secret_id)
+        except ClientError as e:
+            logger.warning(f"DescribeSecret failed for {secret_id}, refetching value: {e}")
+            return None
+        for version_id, stages in meta.get("VersionIdsToStages", {}).items():
+            if "AWSCURRENT" in stages:
+                return version_id
+        return None
+
+    def _store(self, secret_id: str, value, version_id: str):
+        with self._lock:
+            self._entries[secret_id] = {
+                "value": value,
+                "version_id": version_id,
+                "checked_at": time.monotonic(),
+            }
+
+    @staticmethod
+    def _copy(value):
+        # Callers may mutate the dict they get back (e.g. before a put)
+        return dict(value) if isinstance(value, dict) else value
+
+secret_cache = SecretCache(secrets)
 
 # --------------------------------------------------
 # State Definition
@@ -61,7 +168,6 @@ class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
     user_input: str
     tools_available: List[Dict[str, Any]]
-    oauth_token: str
     tool_outputs: List[Dict[str, Any]]
     slack_calls: List[tuple]
     final_answer: str
@@ -99,9 +205,13 @@ def extract_json(text: str):
 
     return None
 
-def get_oauth_token():
-    secret_value = secrets.get_secret_value(SecretId=AGENT_SECRET)
-    secret = json.loads(secret_value["SecretString"])
+TOKEN_REFRESH_MARGIN = int(os.environ.get("TOKEN_REFRESH_MARGIN", "300"))  # seconds before expiry
+
+_token_cache = {}  # (secret_id, scope) -> (access_token, refresh_at)
+_token_lock = threading.Lock()
+
+def fetch_oauth_token(secret_id: str, scope: str = None):
+    secret = secret_cache.get(secret_id)
 
     auth = base64.b64encode(
         f"{secret['CLIENT_ID']}:{secret['CLIENT_SECRET']}".encode()
@@ -114,55 +224,826 @@ def get_oauth_token():
 
     data = {
         "grant_type": "client_credentials",
-        "scope": secret["SCOPE"]
+        "scope": scope or secret["SCOPE"]
     }
 
     response = requests.post(secret["TOKEN_URL"], headers=headers, data=data, timeout=30)
     response.raise_for_status()
-    return response.json()["access_token"]
+    body = response.json()
+    return body["access_token"], int(body.get("expires_in", 3600))
 
-def list_tools(token: str):
-    payload = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
-    headers = {"Authorization": "Bearer " + token, "Content-Type": "application/json"}
-    response = requests.post(GATEWAY_URL, headers=headers, json=payload, timeout=30)
-    response.raise_for_status()
-    return response.json().get("result", {}).get("tools", [])
+def get_oauth_token(secret_id: str = None, scope: str = None):
+    key = (secret_id or AGENT_SECRET, scope)
+
+    with _token_lock:
+        cached = _token_cache.get(key)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+
+    token, expires_in = fetch_oauth_token(key[0], scope)
+    refresh_in = expires_in - min(TOKEN_REFRESH_MARGIN, expires_in // 2)
+    with _token_lock:
+        _token_cache[key] = (token, time.monotonic() + refresh_in)
+
+    logger.info(f"OAuth token refreshed (expires in {expires_in}s)")
+    return token
+
+GATEWAY_POOL_SIZE = int(os.environ.get("GATEWAY_POOL_SIZE", "10"))
+GATEWAY_TIMEOUT = float(os.environ.get("GATEWAY_TIMEOUT", "30"))  # seconds, per call
+TOOL_CONCURRENCY = int(os.environ.get("TOOL_CONCURRENCY", "4"))  # parallel tools/call requests
+GATEWAY_RETRIES = int(os.environ.get("GATEWAY_RETRIES", "2"))  # extra attempts for idempotent tools
+GATEWAY_BACKOFF_BASE = float(os.environ.get("GATEWAY_BACKOFF_BASE", "0.2"))  # seconds
+GATEWAY_BACKOFF_CAP = float(os.environ.get("GATEWAY_BACKOFF_CAP", "3"))  # seconds
+GATEWAY_HEDGE = os.environ.get("GATEWAY_HEDGE", "false").lower() == "true"  # duplicate slow calls after the tool's p95
+CIRCUIT_FAILURES = int(os.environ.get("CIRCUIT_FAILURES", "5"))  # consecutive failures that open a tool's circuit
+CIRCUIT_RESET = float(os.environ.get("CIRCUIT_RESET", "30"))  # seconds open before one trial call
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a tool whose circuit is open."""
+
+class ToolHealth:
+    """Per-tool circuit breakers plus recent call latencies, which set the hedge delay."""
+
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(self, failures: int = CIRCUIT_FAILURES, reset: float = CIRCUIT_RESET, window: int = 100):
+        self._failures = failures
+        self._reset = reset
+        self._window = window
+        self._lock = threading.Lock()
+        self._tools = {}  # name -> {"failures", "opened_at", "probing", "latencies"}
+        self.stats = {"retries": 0, "hedges": 0, "hedge_wins": 0, "short_circuits": 0, "circuit_opens": 0}
+
+    def _state(self, name: str) -> dict:
+        state = self._tools.get(name)
+        if state is None:
+            state = self._tools[name] = {
+                "failures": 0, "opened_at": None, "probing": False,
+                "latencies": deque(maxlen=self._window),
+            }
+        return state
+
+    def allow(self, name: str) -> bool:
+        """False while the circuit is open; after `reset` seconds one trial call goes through."""
+        with self._lock:
+            state = self._state(name)
+            if state["opened_at"] is None:
+                return True
+            if time.monotonic() - state["opened_at"] >= self._reset and not state["probing"]:
+                state["probing"] = True
+                return True
+            self.stats["short_circuits"] += 1
+            return False
+
+    def is_open(self, name: str) -> bool:
+        with self._lock:
+            return self._state(name)["opened_at"] is not None
+
+    def record(self, name: str, ok: bool, latency: float = None):
+        with self._lock:
+            state = self._state(name)
+            state["probing"] = False
+            if ok:
+                state["failures"] = 0
+                state["opened_at"] = None
+                if latency is not None:
+                    state["latencies"].append(latency)
+                return
+            state["failures"] += 1
+            if state["failures"] >= self._failures:
+                if state["opened_at"] is None:
+                    self.stats["circuit_opens"] += 1
+                state["opened_at"] = time.monotonic()
+
+    def note(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def hedge_delay(self, name: str):
+        """The tool's p95 latency, or None until enough calls have been seen."""
+        with self._lock:
+            latencies = sorted(self._state(name)["latencies"])
+        if len(latencies) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+    def open_circuits(self) -> list:
+        with self._lock:
+            return sorted(n for n, s in self._tools.items() if s["opened_at"] is not None)
+
+    @staticmethod
+    def backoff(previous: float, base: float = GATEWAY_BACKOFF_BASE, cap: float = GATEWAY_BACKOFF_CAP) -> float:
+        # Decorrelated jitter: spreads retries out so they do not arrive in waves
+        return min(cap, random.uniform(base, max(base, previous) * 3))
+
+    @staticmethod
+    def is_tool_error(result) -> bool:
+        if not isinstance(result, dict) or "error" in result:
+            return True
+        inner = result.get("result")
+        return isinstance(inner, dict) and bool(inner.get("isError"))
+
+GATEWAY_GZIP_MIN_BYTES = int(os.environ.get("GATEWAY_GZIP_MIN_BYTES", "0"))  # gzip request bodies this large; 0 = never
+
+class TransferStats:
+    """Bytes per JSON-RPC method, as decoded JSON and as carried on the wire."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_method = {}
+
+    def record(self, payload, sent: int, sent_wire: int, received: int, received_wire: int):
+        method = payload.get("method") if isinstance(payload, dict) else "batch"
+        with self._lock:
+            totals = self.by_method.setdefault(method, {
+                "calls": 0, "sent_bytes": 0, "sent_wire_bytes": 0,
+                "received_bytes": 0, "received_wire_bytes": 0,
+            })
+            totals["calls"] += 1
+            totals["sent_bytes"] += sent
+            totals["sent_wire_bytes"] += sent_wire
+            totals["received_bytes"] += received
+            totals["received_wire_bytes"] += received_wire
+        logger.debug(f"{method}: sent {sent_wire}/{sent} B, received {received_wire}/{received} B (wire/decoded)")
+
+def encode_body(payload, gzip_min_bytes: int):
+    """JSON request body plus any Content-Encoding header; gzip only pays off on large bodies."""
+    body = json.dumps(payload).encode("utf-8")
+    if gzip_min_bytes and len(body) >= gzip_min_bytes:
+        return body, gzip.compress(body, compresslevel=5), {"Content-Encoding": "gzip"}
+    return body, body, {}
+
+class GatewayClient:
+    """MCP JSON-RPC client for the AgentCore gateway over a pooled keep-alive session."""
+
+    def __init__(self, url: str, token_provider, pool_size: int = GATEWAY_POOL_SIZE,
+                 timeout: float = GATEWAY_TIMEOUT, gzip_min_bytes: int = GATEWAY_GZIP_MIN_BYTES,
+                 transfer: TransferStats = None):
+        self.url = url
+        self._token_provider = token_provider  # () -> bearer token
+        self._timeout = timeout
+        self._ids = itertools.count(1)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            # gzip/deflate, plus br when brotli is installed; urllib3 decodes chunk by chunk
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        self._gzip_min_bytes = gzip_min_bytes
+        self.transfer = transfer or TransferStats()
+
+    def post(self, payload, timeout: float = None) -> requests.Response:
+        body, wire_body, headers = encode_body(payload, self._gzip_min_bytes)
+        headers["Authorization"] = "Bearer " + self._token_provider()
+        response = self._session.post(self.url, headers=headers, data=wire_body,
+                                      timeout=timeout or self._timeout)
+        if response.status_code == 415 and "Content-Encoding" in headers:
+            logger.warning("Gateway does not accept gzip request bodies; sending them uncompressed")
+            self._gzip_min_bytes = 0
+            return self.post(payload, timeout=timeout)
+        # raw.tell() counts the bytes read off the socket, before decompression
+        self.transfer.record(payload, len(body), len(wire_body), len(response.content), response.raw.tell())
+        return response
+
+    def rpc(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def list_tools(self, timeout: float = None) -> list:
+        return self.rpc("tools/list", timeout=timeout).get("result", {}).get("tools", [])
+
+    def call_tool(self, name: str, arguments: dict, timeout: float = None) -> dict:
+        return self.rpc("tools/call", {"name": name, "arguments": arguments}, timeout=timeout)
+
+class AsyncGatewayClient:
+    """asyncio counterpart of GatewayClient for the graph nodes, on an httpx keep-alive pool."""
+
+    def __init__(self, url: str, token_provider, pool_size: int = GATEWAY_POOL_SIZE,
+                 timeout: float = GATEWAY_TIMEOUT, concurrency: int = TOOL_CONCURRENCY,
+                 retries: int = GATEWAY_RETRIES, hedge: bool = GATEWAY_HEDGE,
+                 gzip_min_bytes: int = GATEWAY_GZIP_MIN_BYTES, transfer: TransferStats = None):
+        self.url = url
+        self._token_provider = token_provider  # () -> bearer token, may block on a refresh
+        self._timeout = timeout
+        self._ids = itertools.count(1)
+        self._retries = retries
+        self._hedge = hedge
+        self.health = ToolHealth()
+        # Shared by all sessions so the gateway never sees more than `concurrency` calls
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers={"Content-Type": "application/json", "Accept": "application/json",
+                     "Accept-Encoding": ACCEPT_ENCODING},  # decoded incrementally by httpx
+        )
+        self._gzip_min_bytes = gzip_min_bytes
+        self.transfer = transfer or TransferStats()
+
+    async def post(self, payload, timeout: float = None) -> httpx.Response:
+        body, wire_body, headers = encode_body(payload, self._gzip_min_bytes)
+        headers["Authorization"] = "Bearer " + await asyncio.to_thread(self._token_provider)
+        response = await self._client.post(self.url, headers=headers, content=wire_body,
+                                           timeout=timeout or self._timeout)
+        if response.status_code == 415 and "Content-Encoding" in headers:
+            logger.warning("Gateway does not accept gzip request bodies; sending them uncompressed")
+            self._gzip_min_bytes = 0
+            return await self.post(payload, timeout=timeout)
+        self.transfer.record(payload, len(body), len(wire_body), len(response.content),
+                             response.num_bytes_downloaded)
+        return response
+
+    async def rpc(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = await self.post(payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def call_tool(self, name: str, arguments: dict, timeout: float = None,
+                        idempotent: bool = True) -> dict:
+        """tools/call behind the tool's circuit breaker; idempotent calls are retried and may be hedged."""
+        if not self.health.allow(name):
+            raise CircuitOpenError(f"{name} is unavailable (circuit open after repeated failures)")
+        params = {"name": name, "arguments": arguments}
+        attempts = 1 + (self._retries if idempotent else 0)
+        delay = 0.0
+        for attempt in range(attempts):
+            start = time.monotonic()
+            try:
+                # One permit per request on the wire; none is held during the backoff sleep
+                async with self._semaphore:
+                    if idempotent and self._hedge:
+                        result = await self._hedged_call(name, params, timeout)
+                    else:
+                        result = await self.rpc("tools/call", params, timeout=timeout)
+            except (httpx.HTTPError, ValueError) as e:
+                response = getattr(e, "response", None) if isinstance(e, httpx.HTTPStatusError) else None
+                if response is not None and response.status_code < 500 and response.status_code != 429:
+                    self.health.record(name, ok=True)  # the gateway answered; not an outage
+                    raise
+                self.health.record(name, ok=False)
+                if attempt + 1 == attempts or self.health.is_open(name):
+                    raise
+                delay = ToolHealth.backoff(delay)
+                self.health.note("retries")
+                logger.warning(f"{name} failed ({e!r}); retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.health.record(name, ok=not ToolHealth.is_tool_error(result), latency=time.monotonic() - start)
+            return result
+
+    async def _hedged_call(self, name: str, params: dict, timeout: float = None) -> dict:
+        # A second identical request once the first has run past the tool's p95;
+        # whichever succeeds first wins and the other is cancelled. The caller holds
+        # the first request's permit; the hedge needs a free one of its own.
+        delay = self.health.hedge_delay(name)
+        if delay is None:
+            return await self.rpc("tools/call", params, timeout=timeout)
+        first = asyncio.ensure_future(self.rpc("tools/call", params, timeout=timeout))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        if self._semaphore.locked():
+            return await first  # every permit is taken: no hedge
+        await self._semaphore.acquire()  # free, so this does not wait
+        self.health.note("hedges")
+        second = asyncio.ensure_future(self._hedge_rpc(params, timeout))
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if task is second:
+                        self.health.note("hedge_wins")
+                    return task.result()
+        return first.result()  # both failed: raise the original error
+
+    async def _hedge_rpc(self, params: dict, timeout: float = None) -> dict:
+        try:
+            return await self.rpc("tools/call", params, timeout=timeout)
+        finally:
+            self._semaphore.release()
+
+    @staticmethod
+    def error_result(name: str, error: Exception) -> dict:
+        """JSON-RPC error object standing in for a call that could not be completed."""
+        return {"jsonrpc": "2.0", "error": {"code": -32000, "message": f"{name} failed: {error}"}}
+
+gateway_transfer = TransferStats()  # tools/list goes through the sync client, tools/call through the async one
+gateway = GatewayClient(GATEWAY_URL, get_oauth_token, transfer=gateway_transfer)
+async_gateway = AsyncGatewayClient(GATEWAY_URL, get_oauth_token, transfer=gateway_transfer)
+
+TOOL_CACHE_SIZE = int(os.environ.get("TOOL_CACHE_SIZE", "256"))  # entries, least recently used evicted
+TOOL_CACHE_DEFAULT_TTL = int(os.environ.get("TOOL_CACHE_DEFAULT_TTL", "0"))  # seconds; 0 = not cached
+# Seconds per tool, keyed by full tool name or by the operation after "___".
+# TOOL_CACHE_TTLS='{"getCityWeather": 300}' adds to / overrides these.
+TOOL_CACHE_TTLS = {
+    "getCityWeather": 600,    # current conditions
+    "forwardGeocode": 86400,  # place coordinates
+    **json.loads(os.environ.get("TOOL_CACHE_TTLS", "{}")),
+}
+# Arguments whose values are looked up case-insensitively; IDs, file names and free text keep their case
+TOOL_CACHE_CASELESS_ARGS = frozenset({"city", "q", "location"})
+
+class ToolResultCache:
+    """LRU cache of successful tools/call results keyed by tool name and canonical arguments."""
+
+    def __init__(self, ttls: dict = TOOL_CACHE_TTLS, default_ttl: int = TOOL_CACHE_DEFAULT_TTL,
+                 max_entries: int = TOOL_CACHE_SIZE, never_cache=None):
+        self._ttls = ttls
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._never_cache = never_cache or (lambda name: False)  # name -> True for side-effecting tools
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (result, expires_at)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def ttl(self, name: str) -> int:
+        if self._never_cache(name):
+            return 0
+        return self._ttls.get(name, self._ttls.get(name.split("___")[-1], self._default_ttl))
+
+    def key(self, name: str, arguments: dict):
+        """Cache key for this call, or None if the tool's results are not cached."""
+        if self.ttl(name) <= 0:
+            return None
+        return name + ":" + json.dumps(self._canonical(arguments), sort_keys=True, separators=(",", ":"))
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, name: str, key: str, result: dict):
+        if not isinstance(result, dict) or "error" in result:
+            return
+        inner = result.get("result")
+        if isinstance(inner, dict) and inner.get("isError"):
+            return
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + self.ttl(name))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    @classmethod
+    def _canonical(cls, value, caseless: bool = False):
+        # " Chicago" and "chicago" are the same city lookup
+        if isinstance(value, str):
+            value = " ".join(value.split())
+            return value.lower() if caseless else value
+        if isinstance(value, dict):
+            return {k: cls._canonical(v, k in TOOL_CACHE_CASELESS_ARGS) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._canonical(v, caseless) for v in value]
+        return value
+
+# Slack posts are side effects and must reach Slack every time
+tool_cache = ToolResultCache(never_cache=lambda name: is_side_effect_tool(name))
+
+def list_tools():
+    return gateway.list_tools()
+
+async def call_tool(name: str, arguments: dict):
+    key = tool_cache.key(name, arguments)
+    result = tool_cache.get(key) if key else None
+    if result is not None:
+        logger.info(f"TOOL: {name} (cached)")
+        return result
 
-def call_tool(token: str, name: str, arguments: dict):
     logger.info(f"TOOL: {name}")
+    try:
+        # Slack posts are not idempotent, so they are never retried or hedged
+        result = await async_gateway.call_tool(name, arguments, idempotent=not is_side_effect_tool(name))
+    except (CircuitOpenError, httpx.HTTPError, ValueError) as e:
+        logger.warning(f"TOOL FAILED: {name}: {e!r}")
+        return AsyncGatewayClient.error_result(name, e)
+    if key:
+        tool_cache.put(name, key, result)
+    return result
 
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {"name": name, "arguments": arguments}
-    }
+async def call_tools(calls: list):
+    return list(await asyncio.gather(*(call_tool(name, arguments) for name, arguments in calls)))
 
-    headers = {"Authorization": "Bearer " + token, "Content-Type": "application/json"}
-    response = requests.post(GATEWAY_URL, headers=headers, json=payload, timeout=30)
-    response.raise_for_status()
+LLM_CACHE_SIZE = int(os.environ.get("LLM_CACHE_SIZE", "512"))  # replies kept in memory, least recently used evicted
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", "3600"))  # seconds; 0 = never expire
+LLM_CACHE_DB = os.environ.get("LLM_CACHE_DB", "")  # SQLite file that survives restarts; empty = memory only
+
+class LLMResponseCache:
+    """Content-addressed cache of model replies: an in-memory LRU in front of an optional SQLite file."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_SIZE, ttl: int = LLM_CACHE_TTL, db_path: str = LLM_CACHE_DB):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (text, expires_at); wall clock, as disk entries outlive the process
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache "
+                             "(key TEXT PRIMARY KEY, text TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key(model_id: str, body: dict) -> str:
+        """Hash of the model id and the full request body (system prompt, messages, inference parameters)."""
+        canonical = json.dumps({"model": model_id, "body": body}, sort_keys=True,
+                               separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT text, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                    return row[0]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, text: str):
+        if not text:
+            return
+        expires_at = time.time() + self._ttl if self._ttl > 0 else float("inf")
+        with self._lock:
+            self._remember(key, text, expires_at)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache (key, text, expires_at) VALUES (?, ?, ?)",
+                                 (key, text, expires_at))
+
+    def _remember(self, key: str, text: str, expires_at: float):
+        self._entries[key] = (text, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+llm_cache = LLMResponseCache()
+
+# --------------------------------------------------
+# Bedrock Rate Limiter
+# --------------------------------------------------
+BEDROCK_RPM = int(os.environ.get("BEDROCK_RPM", "0"))  # model requests per minute for this process; 0 = no limit
+BEDROCK_TPM = int(os.environ.get("BEDROCK_TPM", "0"))  # input + output tokens per minute; 0 = no limit
+
+PRIORITY_INTERACTIVE = 0  # someone is waiting on the answer
+PRIORITY_BACKGROUND = 1   # batch, evaluation or summarisation runs; served when no interactive call waits
+PRIORITIES = {"interactive": PRIORITY_INTERACTIVE, "background": PRIORITY_BACKGROUND}
+
+THROTTLE_CODES = frozenset({"ThrottlingException", "TooManyRequestsException"})
+
+# Priority class of the model calls made by the current request
+bedrock_priority = contextvars.ContextVar("bedrock_priority", default=PRIORITY_INTERACTIVE)
+
+def request_priority(payload: dict) -> int:
+    """{"priority": "background"} in a request payload queues its model calls behind interactive ones."""
+    return PRIORITIES.get(payload.get("priority"), PRIORITY_INTERACTIVE)
+
+class BedrockRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets in front of every Bedrock call in the
+    process, so excess calls queue here instead of spending the service quota on throttled
+    attempts. Waiting calls go in priority order, then arrival order. Tokens are reserved
+    up front (prompt estimate + max reply) and settled with the real count afterwards.
+    Rates adapt AIMD-style: a throttling response (including ones the client retries on
+    its own) halves them, each completed call wins back a small step.
+    """
+
+    DECREASE = 0.5       # rate factor after a throttle
+    INCREASE = 0.05      # added back per completed call, up to the configured rates
+    MIN_SCALE = 0.1
+    DECREASE_GAP = 1.0   # seconds; throttles from calls already in flight count once
+
+    def __init__(self, rpm: int = BEDROCK_RPM, tpm: int = BEDROCK_TPM):
+        self._rpm, self._tpm = rpm, tpm
+        self._scale = 1.0
+        self._requests, self._tokens = float(rpm), float(tpm)  # buckets start full
+        self._refilled = time.monotonic()
+        self._decreased = 0.0
+        self._waiting = []  # heap of (priority, arrival) tickets
+        self._arrivals = itertools.count()
+        self._cond = asyncio.Condition()
+        self.stats = {"calls": 0, "waits": 0, "wait_ms": 0, "background_calls": 0,
+                      "throttles": 0, "rate_scale": 1.0}
+
+    async def acquire(self, tokens: int) -> int:
+        """Waits until this call may go; returns the tokens reserved, to pass to release()."""
+        ticket = (bedrock_priority.get(), next(self._arrivals))
+        start = time.monotonic()
+        async with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while (delay := self._delay(ticket, tokens)) != 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                reserved = self._take(tokens)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            self._waited(ticket[0], time.monotonic() - start)
+        return reserved
+
+    async def release(self, reserved: int, used_tokens: int = None):
+        """Settles the reservation once the call ends; used_tokens is None if it failed."""
+        async with self._cond:
+            self._settle(reserved, used_tokens)
+            self._cond.notify_all()
+
+    def on_attempt(self, response=None, **kwargs):
+        """botocore needs-retry hook: sees every attempt, including the client's own retries."""
+        if response is not None and response[1].get("Error", {}).get("Code") in THROTTLE_CODES:
+            # Called on the agent loop, like every other limiter method
+            self.throttled()
+        # None leaves the retry decision to botocore's own handler
+
+    def throttled(self):
+        now = time.monotonic()
+        self.stats["throttles"] += 1
+        if now - self._decreased < self.DECREASE_GAP:
+            return
+        self._decreased = now
+        self._refill()
+        self._scale = max(self.MIN_SCALE, self._scale * self.DECREASE)
+        # Start the lower rate from empty buckets, so the next calls are spaced out at once
+        self._requests, self._tokens = min(self._requests, 0.0), min(self._tokens, 0.0)
+        self.stats["rate_scale"] = round(self._scale, 3)
+        logger.warning(f"Bedrock throttled; request and token rates cut to {self._scale:.0%}")
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._refilled = now - self._refilled, now
+        if self._rpm:
+            rate = self._rpm * self._scale
+            self._requests = min(rate, self._requests + elapsed * rate / 60)
+        if self._tpm:
+            rate = self._tpm * self._scale
+            self._tokens = min(rate, self._tokens + elapsed * rate / 60)
+
+    def _delay(self, ticket, tokens: int):
+        """0 if ticket may go now, else seconds until the buckets allow it (None: not its turn yet)."""
+        if self._waiting[0] != ticket:
+            return None
+        self._refill()
+        delay = 0.0
+        if self._rpm and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60 / (self._rpm * self._scale))
+        if self._tpm:
+            # A request larger than a minute's budget goes once the bucket is full
+            need = min(tokens, self._tpm * self._scale)
+            if self._tokens < need:
+                delay = max(delay, (need - self._tokens) * 60 / (self._tpm * self._scale))
+        return delay
+
+    def _take(self, tokens: int) -> int:
+        reserved = min(tokens, int(self._tpm * self._scale)) if self._tpm else 0
+        if self._rpm:
+            self._requests -= 1
+        self._tokens -= reserved
+        return reserved
+
+    def _settle(self, reserved: int, used_tokens: int):
+        if used_tokens is None:
+            # A failed or throttled call consumed no tokens: give the whole reservation back
+            if self._tpm:
+                self._tokens = min(self._tpm * self._scale, self._tokens + reserved)
+            return
+        if self._tpm:
+            self._tokens += reserved - used_tokens  # refund the unused part, or charge the overrun
+        self._scale = min(1.0, self._scale + self.INCREASE)
+        self.stats["rate_scale"] = round(self._scale, 3)
+
+    def _waited(self, priority: int, seconds: float):
+        self.stats["calls"] += 1
+        if priority != PRIORITY_INTERACTIVE:
+            self.stats["background_calls"] += 1
+        if seconds >= 0.01:
+            self.stats["waits"] += 1
+            self.stats["wait_ms"] += round(seconds * 1000)
+            logger.info(f"Bedrock call waited {seconds * 1000:.0f} ms for rate limit capacity")
+
+bedrock_limiter = BedrockRateLimiter()
+
+# With a rate limit set, the limiter alone reacts to throttling; adaptive retries would add
+# botocore's own client-side rate limiter as a second feedback loop on the same signal
+BEDROCK_CLIENT_CONFIG = (
+    AWS_ASYNC_CLIENT_CONFIG.merge(AioConfig(retries={"mode": "standard", "total_max_attempts": AWS_MAX_ATTEMPTS}))
+    if BEDROCK_RPM or BEDROCK_TPM else AWS_ASYNC_CLIENT_CONFIG
+)
+
+# --------------------------------------------------
+# LLM Wrapper
+# --------------------------------------------------
+_bedrock_client = None  # task that opens the aiobotocore client on the agent loop
+
+async def open_bedrock():
+    # Kept for the life of the process, so the client context is never exited
+    client = await get_session().create_client("bedrock-runtime", region_name=AWS_REGION,
+                                               config=BEDROCK_CLIENT_CONFIG).__aenter__()
+    # First, so the limiter sees throttled attempts before the retry handler acts on them
+    client.meta.events.register_first("needs-retry.bedrock-runtime", bedrock_limiter.on_attempt)
+    return client
+
+async def get_bedrock():
+    global _bedrock_client
+    if _bedrock_client is None or (_bedrock_client.done() and _bedrock_client.exception()):
+        _bedrock_client = asyncio.ensure_future(open_bedrock())
+    return await _bedrock_client
+
+# Model for each kind of call: tool plans are short JSON a small model
+# handles well; the text users read stays on the large model
+MODEL_BY_ROLE = {"plan": PLAN_MODEL_ID, "synthesise": SYNTHESIS_MODEL_ID}
+
+# USD per million input / output tokens by model family, for the cost estimate in /stats.
+# Prompt-cache reads bill at 0.1x the input price and cache writes at 1.25x.
+MODEL_PRICES = {
+    "claude-sonnet-4-5": (3.00, 15.00),
+    "claude-haiku-4-5": (1.00, 5.00),
+    "claude-3-sonnet": (3.00, 15.00),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+def estimate_cost(model_id: str, input_tokens: int, output_tokens: int,
+                  cache_read_tokens: int, cache_write_tokens: int) -> float:
+    price_in, price_out = next((p for family, p in MODEL_PRICES.items() if family in model_id), (0.0, 0.0))
+    billed_in = input_tokens + 0.1 * cache_read_tokens + 1.25 * cache_write_tokens
+    return (billed_in * price_in + output_tokens * price_out) / 1_000_000
+
+class LLMUsage:
+    """Bedrock model calls, tokens, latency and estimated cost since start-up, in total and per call role."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "input_tokens": 0, "output_tokens": 0,
+                      "cache_read_tokens": 0, "cache_write_tokens": 0, "cost_usd": 0.0, "by_role": {}}
 
-    return response.json()
+    def record(self, role: str, model_id: str, seconds: float, input_tokens: int = 0, output_tokens: int = 0,
+               cache_read_tokens: int = 0, cache_write_tokens: int = 0):
+        """input_tokens excludes the prompt tokens read from or written to the prompt cache."""
+        tokens = {"input_tokens": input_tokens or 0, "output_tokens": output_tokens or 0,
+                  "cache_read_tokens": cache_read_tokens or 0, "cache_write_tokens": cache_write_tokens or 0}
+        cost = estimate_cost(model_id, **tokens)
+        with self._lock:
+            role_stats = self._role(role)
+            for stats in (self.stats, role_stats):
+                stats["calls"] += 1
+                for key, value in tokens.items():
+                    stats[key] += value
+                stats["cost_usd"] = round(stats["cost_usd"] + cost, 6)
+            role_stats["total_ms"] += round(seconds * 1000)
+            role_stats["avg_ms"] = role_stats["total_ms"] // role_stats["calls"]
+            role_stats["models"][model_id] = role_stats["models"].get(model_id, 0) + 1
+        logger.info(f"LLM {role} on {model_id}: {tokens['input_tokens']} in, {tokens['cache_read_tokens']} cache read, "
+                    f"{tokens['cache_write_tokens']} cache write, {tokens['output_tokens']} out, {seconds * 1000:.0f} ms")
 
-def call_llm(messages):
+    def fallback(self, role: str):
+        with self._lock:
+            self._role(role)["fallbacks"] += 1
+
+    def _role(self, role: str) -> dict:
+        if role not in self.stats["by_role"]:
+            self.stats["by_role"][role] = {"calls": 0, "fallbacks": 0, "input_tokens": 0, "output_tokens": 0,
+                                           "cache_read_tokens": 0, "cache_write_tokens": 0, "cost_usd": 0.0,
+                                           "total_ms": 0, "avg_ms": 0, "models": {}}
+        return self.stats["by_role"][role]
+
+llm_usage = LLMUsage()
+
+async def text_deltas(response, usage: dict):
+    """Text pieces of an invoke_model_with_response_stream reply, in order; token counts go into usage."""
+    async for event in response["body"]:
+        chunk = json.loads(event["chunk"]["bytes"]) if "chunk" in event else {}
+        if chunk.get("type") == "content_block_delta" and chunk["delta"].get("type") == "text_delta":
+            yield chunk["delta"]["text"]
+        # Bedrock appends the token counts to the last chunk
+        metrics = chunk.get("amazon-bedrock-invocationMetrics")
+        if metrics:
+            usage.update(input_tokens=metrics.get("inputTokenCount"), output_tokens=metrics.get("outputTokenCount"),
+                         cache_read_tokens=metrics.get("cacheReadInputTokenCount"),
+                         cache_write_tokens=metrics.get("cacheWriteInputTokenCount"))
+
+async def send_llm_request(model_id: str, body: dict, on_text=None):
+    """(reply text, token usage) of one invoke_model call; streamed to on_text if given."""
+    bedrock = await get_bedrock()
+    usage = {}
+    if on_text:
+        response = await bedrock.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=json.dumps(body).encode("utf-8"),
+            contentType="application/json",
+            accept="application/json"
+        )
+        parts = []
+        async for text in text_deltas(response, usage):
+            parts.append(text)
+            on_text(text)
+        content = "".join(parts)
+    else:
+        response = await bedrock.invoke_model(
+            modelId=model_id,
+            body=json.dumps(body).encode("utf-8"),
+            contentType="application/json",
+            accept="application/json"
+        )
+
+        async with response["body"] as stream:
+            data = json.loads(await stream.read())
+        reply_usage = data.get("usage", {})
+        usage = {"input_tokens": reply_usage.get("input_tokens"), "output_tokens": reply_usage.get("output_tokens"),
+                 "cache_read_tokens": reply_usage.get("cache_read_input_tokens"),
+                 "cache_write_tokens": reply_usage.get("cache_creation_input_tokens")}
+        content = data.get("content", "")
+        if isinstance(content, list) and content:
+            content = content[0].get("text", "")
+    return content, usage
+
+async def invoke_llm(role: str, model_id: str, body: dict, on_text=None) -> str:
+    """One Bedrock request for call_llm: rate-limited, timed and recorded in llm_usage under role."""
+    reserved = await bedrock_limiter.acquire(estimate_tokens(json.dumps(body)) + body["max_tokens"])
+    usage = None
+    try:
+        start = time.perf_counter()
+        content, usage = await send_llm_request(model_id, body, on_text)
+        llm_usage.record(role, model_id, time.perf_counter() - start, **usage)
+    finally:
+        await bedrock_limiter.release(reserved, None if usage is None else sum(n or 0 for n in usage.values()))
+    return content
+
+async def call_llm(messages, cache: bool = False, on_text=None, system: list = None,
+                   role: str = "synthesise", validate=None):
+    """
+    role ("plan" or "synthesise") picks the model from MODEL_BY_ROLE.
+    validate, if given, checks a non-streamed reply; when the check fails (or the call errors) on a
+    smaller model, the request is repeated once on the synthesis model.
+    cache=True serves repeats of the exact same request from llm_cache; only for deterministic prompts.
+    on_text, if given, is called (on the agent loop) with each piece of the reply as Bedrock streams it.
+    system is a list of system content blocks, e.g. from planner_system().
+    """
     body = {
         "anthropic_version": "bedrock-2023-05-31",
         "messages": messages,
         "max_tokens": 800,
         "temperature": 0.2
     }
+    if system:
+        body["system"] = system
+    model_id = MODEL_BY_ROLE[role]
+    cache_key = LLMResponseCache.key(model_id, body) if cache else None
+    if cache_key:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            if on_text:
+                on_text(cached)
+            return cached
 
-    response = bedrock.invoke_model(
-        modelId=MODEL_ID,
-        body=json.dumps(body).encode("utf-8"),
-        contentType="application/json",
-        accept="application/json"
-    )
-
-    data = json.loads(response["body"].read())
-    content = data.get("content", "")
-    if isinstance(content, list) and content:
-        return content[0].get("text", "")
+    fallback_id = MODEL_BY_ROLE["synthesise"]
+    if validate and not on_text and model_id != fallback_id:
+        try:
+            content = await invoke_llm(role, model_id, body)
+        except Exception as e:
+            logger.warning(f"LLM {role} call on {model_id} failed: {e}")
+            content = None
+        if content is None or not validate(content):
+            llm_usage.fallback(role)
+            logger.warning(f"LLM {role} reply from {model_id} unusable; retrying on {fallback_id}")
+            content = await invoke_llm(role, fallback_id, body)
+            cache_key = None  # the key is for model_id, which did not answer
+    else:
+        content = await invoke_llm(role, model_id, body, on_text)
+    if cache_key and (not validate or validate(content)):
+        llm_cache.put(cache_key, content)
     return content
 
 def is_slack_post_tool(tool_name: str, tool_def: dict) -> bool:
@@ -173,69 +1054,274 @@ def is_slack_post_tool(tool_name: str, tool_def: dict) -> bool:
         or ("slack" in desc and "message" in desc)
     )
 
-# --------------------------------------------------
-# LangGraph Node Functions
-# --------------------------------------------------
-def initialize_state(state: AgentState) -> AgentState:
-    logger.info(f"Session {state['session_id'][:8]}: Init")
-    
-    token = get_oauth_token()
-    tools = list_tools(token)
-    
-    return {
-        **state,
-        "oauth_token": token,
-        "tools_available": tools,
-        "tool_outputs": [],
-        "slack_calls": [],
-        "planned_actions": [],
-        "messages": [HumanMessage(content=state["user_input"])]
-    }
+TOOL_CATALOG_TTL = int(os.environ.get("TOOL_CATALOG_TTL", "300"))  # seconds before a background refresh
 
-def plan_actions(state: AgentState) -> AgentState:
-    logger.info(f"Session {state['session_id'][:8]}: Planning")
-    
-    tools = state["tools_available"]
-    user_text = state["user_input"]
-    
-    decision_prompt = f"""
-You are an AI agent with multiple tools.
+class ToolCatalog:
+    """Cached tools/list result; a stale catalog is served while a background refresh runs."""
+
+    def __init__(self, load_tools, build_index, ttl: int = TOOL_CATALOG_TTL):
+        self._load_tools = load_tools    # () -> list of tool defs
+        self._build_index = build_index  # list of tool defs -> snapshot dict
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self.stats = {"hits": 0, "loads": 0, "background_refreshes": 0, "errors": 0}
 
-TOOLS AVAILABLE:
-{json.dumps(tools, indent=2)}
+    def get(self) -> dict:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                self.stats["hits"] += 1
+                if time.monotonic() - self._loaded_at >= self._ttl and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._background_refresh, name="tool-catalog", daemon=True).start()
+                return snapshot
+        return self.refresh(only_if_empty=True)
 
+    def refresh(self, only_if_empty: bool = False) -> dict:
+        with self._load_lock:
+            if only_if_empty and self._snapshot is not None:
+                return self._snapshot
+            snapshot = self._build_index(self._load_tools())
+            with self._lock:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+                self.stats["loads"] += 1
+        return snapshot
+
+    def current(self):
+        """The loaded snapshot without loading or refreshing it; None before the first load."""
+        with self._lock:
+            return self._snapshot
+
+    def mark_stale(self):
+        """Next get() triggers a background refresh, e.g. after the planner names an unknown tool."""
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+            with self._lock:
+                self.stats["background_refreshes"] += 1
+        except Exception as e:
+            logger.warning(f"Tool catalog refresh failed, keeping previous catalog: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+# --------------------------------------------------
+# Planning Prompt
+# --------------------------------------------------
+PLANNER_RULES = """
 RULES:
 - Return ONLY a JSON list.
 - Each item must be either:
 
 1. Tool call:
-   {{
+   {
      "action": "tool",
      "name": "<exact tool name>",
-     "arguments": {{...}}
-   }}
+     "arguments": {...}
+   }
 
 2. Final answer:
-   {{
+   {
      "action": "answer"
-   }}
+   }
 
 If the user explicitly provides Slack message content,
 call the Slack tool directly using that content.
 
 No extra text.
-
-USER INPUT:
-{user_text}
 """
 
-    raw = call_llm([{"role": "user", "content": decision_prompt}])
+def planner_system(tools: list) -> list:
+    """
+    The planning prompt's static part (tool catalog and rules) as a system prefix. It is
+    byte-identical for every request against the same catalog, so Bedrock's prompt cache
+    serves it after the first call; only the user input after it is new.
+    """
+    block = {
+        "type": "text",
+        "text": "You are an AI agent with multiple tools.\n\nTOOLS AVAILABLE:\n"
+                + json.dumps(tools, indent=2) + "\n" + PLANNER_RULES,
+    }
+    if PROMPT_CACHE:
+        block["cache_control"] = {"type": "ephemeral"}
+    return [block]
+
+def planner_messages(user_text: str) -> list:
+    return [{"role": "user", "content": f"USER INPUT:\n{user_text}"}]
+
+def valid_plan(raw: str, catalog: dict) -> bool:
+    """A planner reply the agent can act on: JSON actions that each answer or call a known tool."""
+    actions = extract_json(raw)
+    if not actions:
+        return False
+    for action in actions if isinstance(actions, list) else [actions]:
+        if not isinstance(action, dict):
+            return False
+        if action.get("action") == "tool" and action.get("name") not in catalog["by_name"]:
+            return False
+        if action.get("action") not in ("tool", "answer"):
+            return False
+    return True
+
+def index_tools(tools: list) -> dict:
+    by_name = {t.get("name"): t for t in tools if t.get("name")}
+    return {
+        "tools": tools,
+        "by_name": by_name,
+        "slack_tools": frozenset(n for n, t in by_name.items() if is_slack_post_tool(n, t)),
+        "planner_system": planner_system(tools),
+    }
+
+tool_catalog = ToolCatalog(list_tools, index_tools)
+
+def is_side_effect_tool(name: str) -> bool:
+    """Slack posts: never retried, hedged or cached. Uses the catalog's description check once loaded."""
+    catalog = tool_catalog.current()
+    if catalog is not None and name in catalog["by_name"]:
+        return name in catalog["slack_tools"]
+    return is_slack_post_tool(name, {})
+
+# --------------------------------------------------
+# Tool Output Compaction
+# --------------------------------------------------
+TOOL_OUTPUT_TOKEN_BUDGET = int(os.environ.get("TOOL_OUTPUT_TOKEN_BUDGET", "1500"))  # per tool output; 0 = no limit
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English and JSON; close enough for budgeting
+    return (len(text) + 3) // 4
+
+def compact_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+class ToolOutputCompactor:
+    """
+    Tool outputs as compact prompt text: JSON-RPC envelopes stripped, no pretty-print
+    whitespace, and each output cut down to a token budget by shortening long strings
+    and lists (with a note of what was dropped).
+    """
+
+    def __init__(self, budget: int = TOOL_OUTPUT_TOKEN_BUDGET):
+        self._budget = budget
+        self._lock = threading.Lock()
+        self.stats = {"prompts": 0, "tokens_before": 0, "tokens_after": 0, "truncated_outputs": 0}
+
+    def compact(self, tool_outputs: list) -> str:
+        outputs, truncated = [], 0
+        for item in tool_outputs:
+            output, cut = self._fit(self.unwrap(item.get("result")))
+            outputs.append({"tool": item.get("name"), "output": output})
+            truncated += cut
+        text = compact_json(outputs)
+
+        before = estimate_tokens(json.dumps(tool_outputs, indent=2))
+        after = estimate_tokens(text)
+        with self._lock:
+            self.stats["prompts"] += 1
+            self.stats["tokens_before"] += before
+            self.stats["tokens_after"] += after
+            self.stats["truncated_outputs"] += truncated
+        logger.info(f"Tool outputs compacted: ~{before} -> ~{after} tokens ({truncated} truncated)")
+        return text
+
+    @staticmethod
+    def unwrap(result):
+        """The tool's own payload from a tools/call response, without the JSON-RPC wrapping."""
+        if not isinstance(result, dict):
+            return result
+        if "error" in result:
+            error = result["error"]
+            return {"error": error.get("message", error) if isinstance(error, dict) else error}
+        inner = result.get("result", result)
+        if not isinstance(inner, dict) or "content" not in inner:
+            return inner
+        values = []
+        for item in inner.get("content", []):
+            text = item.get("text") if isinstance(item, dict) else None
+            if text is None:
+                values.append(item)
+                continue
+            try:
+                values.append(json.loads(text))
+            except ValueError:
+                values.append(text)
+        value = values[0] if len(values) == 1 else values
+        return {"error": value} if inner.get("isError") else value
+
+    def _fit(self, value):
+        """(value, 1 if it had to be shortened to fit the budget else 0)."""
+        if not self._budget or estimate_tokens(compact_json(value)) <= self._budget:
+            return value, 0
+        max_chars, max_items = self._budget * 4, 50
+        while max_chars > 64 or max_items > 3:
+            max_chars, max_items = max(64, max_chars // 2), max(3, max_items // 2)
+            shortened = self._shorten(value, max_chars, max_items)
+            if estimate_tokens(compact_json(shortened)) <= self._budget:
+                return shortened, 1
+        # Still too big (e.g. a very wide object): hard cut of the serialised value
+        text = compact_json(value)
+        return text[:self._budget * 4] + f"...[{len(text) - self._budget * 4} more chars]", 1
+
+    @classmethod
+    def _shorten(cls, value, max_chars: int, max_items: int):
+        if isinstance(value, str):
+            if len(value) <= max_chars:
+                return value
+            return value[:max_chars] + f"...[{len(value) - max_chars} more chars]"
+        if isinstance(value, list):
+            items = [cls._shorten(v, max_chars, max_items) for v in value[:max_items]]
+            if len(value) > max_items:
+                items.append(f"...[{len(value) - max_items} more items]")
+            return items
+        if isinstance(value, dict):
+            return {k: cls._shorten(v, max_chars, max_items) for k, v in value.items()}
+        return value
+
+tool_output_compactor = ToolOutputCompactor()
+
+# --------------------------------------------------
+# LangGraph Node Functions
+# --------------------------------------------------
+async def initialize_state(state: AgentState) -> AgentState:
+    logger.info(f"Session {state['session_id'][:8]}: Init")
+    
+    # Only blocks (in a worker thread) on the first load; later calls return the cached catalog
+    tools = (await asyncio.to_thread(tool_catalog.get))["tools"]
+    
+    return {
+        **state,
+        "tools_available": tools,
+        "tool_outputs": [],
+        "slack_calls": [],
+        "planned_actions": [],
+        "messages": [HumanMessage(content=state["user_input"])]
+    }
+
+async def plan_actions(state: AgentState, config: RunnableConfig) -> AgentState:
+    logger.info(f"Session {state['session_id'][:8]}: Planning")
+    
+    user_text = state["user_input"]
+    
+    # Static catalog + rules as a cached system prefix; only the user input varies
+    catalog = await asyncio.to_thread(tool_catalog.get)
+    raw = await call_llm(planner_messages(user_text), cache=True, system=catalog["planner_system"],
+                         role="plan", validate=lambda reply: valid_plan(reply, catalog))
     actions = extract_json(raw)
     
     if not actions:
         return {
             **state,
-            "final_answer": call_llm([{"role": "user", "content": user_text}]),
+            "final_answer": await call_llm([{"role": "user", "content": user_text}],
+                                           on_text=config["configurable"].get("on_text")),
             "planned_actions": []
         }
     
@@ -247,29 +1333,38 @@ USER INPUT:
         "planned_actions": actions
     }
 
-def execute_data_tools(state: AgentState) -> AgentState:
+async def execute_data_tools(state: AgentState) -> AgentState:
     logger.info(f"Session {state['session_id'][:8]}: Executing tools")
     
     actions = state.get("planned_actions", [])
-    tools_by_name = {t.get("name"): t for t in state["tools_available"] if t.get("name")}
+    catalog = await asyncio.to_thread(tool_catalog.get)
+    tools_by_name = catalog["by_name"]
     
     tool_outputs = state["tool_outputs"].copy()
     slack_calls = state["slack_calls"].copy()
     messages = state["messages"].copy()
+    data_calls = []
     
     for action in actions:
         if action.get("action") == "tool":
             name = action.get("name")
             args = action.get("arguments", {}) or {}
-            tool_def = tools_by_name.get(name, {})
+            if name in tools_by_name:
+                is_slack = name in catalog["slack_tools"]
+            else:
+                tool_catalog.mark_stale()
+                is_slack = is_slack_post_tool(name, {})
             
-            if is_slack_post_tool(name, tool_def):
+            if is_slack:
                 slack_calls.append((name, args))
                 continue
             
-            result = call_tool(state["oauth_token"], name, args)
-            tool_outputs.append({"name": name, "result": result})
-            messages.append(AIMessage(content=f"Used tool {name}"))
+            data_calls.append((name, args))
+    
+    # Independent data tools run in parallel; outputs keep the planned order
+    for (name, _), result in zip(data_calls, await call_tools(data_calls)):
+        tool_outputs.append({"name": name, "result": result})
+        messages.append(AIMessage(content=f"Used tool {name}"))
     
     return {
         **state,
@@ -278,7 +1373,7 @@ def execute_data_tools(state: AgentState) -> AgentState:
         "messages": messages
     }
 
-def handle_slack_tools(state: AgentState) -> AgentState:
+async def handle_slack_tools(state: AgentState) -> AgentState:
     logger.info(f"Session {state['session_id'][:8]}: Slack handling")
     
     slack_calls = state["slack_calls"]
@@ -293,7 +1388,7 @@ def handle_slack_tools(state: AgentState) -> AgentState:
             if not args.get("text"):
                 args["text"] = user_text
             
-            result = call_tool(state["oauth_token"], name, args)
+            result = await call_tool(name, args)
             tool_outputs.append({"name": name, "result": result})
     
     else:
@@ -311,14 +1406,14 @@ User request:
 {user_text}
 
 Tool results:
-{json.dumps(tool_outputs, indent=2)}
+{tool_output_compactor.compact(tool_outputs)}
 """
         
-        final_slack_message = call_llm([{"role": "user", "content": slack_prompt}]).strip()
+        final_slack_message = (await call_llm([{"role": "user", "content": slack_prompt}])).strip()
         
         for name, args in slack_calls:
             args["text"] = final_slack_message
-            result = call_tool(state["oauth_token"], name, args)
+            result = await call_tool(name, args)
             tool_outputs.append({"name": name, "result": result})
     
     return {
@@ -326,7 +1421,7 @@ Tool results:
         "tool_outputs": tool_outputs
     }
 
-def generate_final_response(state: AgentState) -> AgentState:
+async def generate_final_response(state: AgentState, config: RunnableConfig) -> AgentState:
     logger.info(f"Session {state['session_id'][:8]}: Generating response")
     
     user_text = state["user_input"]
@@ -348,10 +1443,11 @@ User question:
 {user_text}
 
 Tool results:
-{json.dumps(tool_outputs, indent=2)}
+{tool_output_compactor.compact(tool_outputs)}
 """
     
-    final_answer = call_llm([{"role": "user", "content": summary_prompt}])
+    final_answer = await call_llm([{"role": "user", "content": summary_prompt}],
+                                  on_text=config["configurable"].get("on_text"))
     messages = state["messages"].copy()
     messages.append(AIMessage(content=final_answer))
     
@@ -405,10 +1501,43 @@ def create_agent_workflow():
 
 agent_workflow = create_agent_workflow()
 
+# --------------------------------------------------
+# Agent Event Loop
+# --------------------------------------------------
+class AgentLoop:
+    """A single asyncio loop in a daemon thread that every graph run is scheduled on."""
+
+    def __init__(self, name: str = "agent-loop"):
+        self.loop = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+        self._ready.wait()
+
+    def _run(self):
+        # Created inside the thread so no running-loop state leaks in from the parent
+        # (OpenTelemetry's threading instrumentation propagates context across threads)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedules `coro` on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+agent_loop = AgentLoop()
+
 # --------------------------------------------------
 # Simple Session Handling
 # --------------------------------------------------
-def run_agent(user_text: str) -> str:
+def run_agent(user_text: str, priority: int = PRIORITY_INTERACTIVE) -> str:
+    """Synchronous entry point: runs the graph on the agent loop and waits for it."""
+    return agent_loop.submit(run_agent_async(user_text, priority=priority)).result()
+
+async def run_agent_async(user_text: str, on_text=None, priority: int = PRIORITY_INTERACTIVE) -> str:
+    """Runs the graph once; on_text receives the user-facing answer as it streams from Bedrock."""
+    # Each run is its own task, so this applies to this run's model calls only
+    bedrock_priority.set(priority)
     session_id = str(uuid.uuid4())
     logger.info(f"Session {session_id[:8]}: Starting")
     
@@ -416,7 +1545,6 @@ def run_agent(user_text: str) -> str:
         "messages": [],
         "user_input": user_text,
         "tools_available": [],
-        "oauth_token": "",
         "tool_outputs": [],
         "slack_calls": [],
         "final_answer": "",
@@ -424,11 +1552,33 @@ def run_agent(user_text: str) -> str:
         "session_id": session_id
     }
     
-    final_state = agent_workflow.invoke(initial_state)
+    # Nodes read on_text from the run config; it is not part of the graph state
+    final_state = await agent_workflow.ainvoke(initial_state, config={"configurable": {"on_text": on_text}})
     
     logger.info(f"Session {session_id[:8]}: Complete")
     return final_state["final_answer"]
 
+# --------------------------------------------------
+# Startup Warm-up
+# --------------------------------------------------
+WARMUP_ON_START = os.environ.get("WARMUP_ON_START", "true").lower() == "true"
+AGENT_SERVER = os.environ.get("AGENT_SERVER", "flask").lower()  # "flask" or "asgi"
+warmup_done = threading.Event()
+warmup_done.set()  # cleared only while a start-up warm-up runs
+
+def warm_up():
+    """Primes the gateway token and tool catalog before the first graph run."""
+    start = time.monotonic()
+    try:
+        get_oauth_token()  # Secrets Manager + Cognito
+        tool_catalog.get() # gateway DNS/TLS (kept in the pool) + tool catalog
+        agent_loop.submit(get_bedrock()).result()  # Bedrock client + credentials
+    except Exception as e:
+        logger.warning(f"Warm-up incomplete, continuing lazily: {e}")
+    finally:
+        warmup_done.set()
+        logger.info(f"Warm-up finished in {time.monotonic() - start:.2f}s")
+
 # --------------------------------------------------
 # Flask Endpoints
 # --------------------------------------------------
@@ -436,17 +1586,97 @@ def run_agent(user_text: str) -> str:
 def root():
     return invocations()
 
+def sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+def wants_stream(payload) -> bool:
+    return bool(payload.get("stream")) or "text/event-stream" in request.headers.get("Accept", "")
+
+def stream_agent(user_text, priority: int = PRIORITY_INTERACTIVE):
+    """SSE events for Flask: {"delta": ...} per answer piece from the agent loop, then the completion."""
+    events = queue.Queue()
+    future = agent_loop.submit(run_agent_async(user_text, on_text=lambda text: events.put({"delta": text}),
+                                               priority=priority))
+    future.add_done_callback(lambda _: events.put(None))
+    while (event := events.get()) is not None:
+        yield sse(event)
+    try:
+        yield sse({"completion": future.result(), "stop_reason": "end_turn"})
+    except Exception as e:
+        logger.exception("Agent execution failed")
+        yield sse({"error": str(e)})
+
+async def stream_agent_events(user_text, priority: int = PRIORITY_INTERACTIVE):
+    """The same events for AgentCore, which relays each yielded dict as SSE."""
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    put = lambda event: loop.call_soon_threadsafe(events.put_nowait, event)
+    future = agent_loop.submit(run_agent_async(user_text, on_text=lambda text: put({"delta": text}),
+                                               priority=priority))
+    future.add_done_callback(lambda _: put(None))
+    while (event := await events.get()) is not None:
+        yield event
+    try:
+        yield {"completion": future.result(), "stop_reason": "end_turn"}
+    except Exception as e:
+        logger.exception("Agent execution failed")
+        yield {"error": str(e)}
+
 @flask_app.route("/invocations", methods=["POST"])
 def invocations():
     payload = request.get_json() or {}
     user_text = payload.get("input", {}).get("text", "")
+    priority = request_priority(payload)
+    
+    if wants_stream(payload):
+        return Response(stream_agent(user_text, priority), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"})
     
-    result = run_agent(user_text)
+    result = run_agent(user_text, priority)
     return jsonify({"completion": result, "stop_reason": "end_turn"}), 200
 
+@flask_app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({
+        "secrets": secret_cache.stats,
+        "tool_catalog": tool_catalog.stats,
+        "tool_results": tool_cache.stats,
+        "gateway": {**async_gateway.health.stats, "open_circuits": async_gateway.health.open_circuits()},
+        "gateway_transfer": gateway_transfer.by_method,
+        "llm_cache": llm_cache.stats,
+        "llm": llm_usage.stats,
+        "tool_output_compaction": tool_output_compactor.stats,
+        "bedrock_limiter": bedrock_limiter.stats
+    }), 200
+
 @flask_app.route("/ping", methods=["GET"])
 def ping():
+    if not warmup_done.is_set():
+        return jsonify({"status": "HealthyBusy"}), 200  # as the AgentCore ping reports it
     return jsonify({"status": "ok"}), 200
 
+# --------------------------------------------------
+# AgentCore Endpoints (AGENT_SERVER=asgi)
+# --------------------------------------------------
+@agent.entrypoint
+async def agent_invocation(payload):
+    # Waiting on the agent loop holds no thread, so concurrent sessions share one loop
+    user_text = payload.get("input", {}).get("text", "")
+    priority = request_priority(payload)
+    if payload.get("stream"):
+        return stream_agent_events(user_text, priority)
+    result = await asyncio.wrap_future(agent_loop.submit(run_agent_async(user_text, priority=priority)))
+    return {"completion": result, "stop_reason": "end_turn"}
+
+@agent.ping
+def agent_ping():
+    return PingStatus.HEALTHY if warmup_done.is_set() else PingStatus.HEALTHY_BUSY
+
 if __name__ == "__main__":
-    flask_app.run(host="0.0.0.0", port=8080)
+    if WARMUP_ON_START:
+        warmup_done.clear()
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    if AGENT_SERVER == "asgi":
+        agent.run(host="0.0.0.0", port=8080)
+    else:
+        flask_app.run(host="0.0.0.0", port=8080)
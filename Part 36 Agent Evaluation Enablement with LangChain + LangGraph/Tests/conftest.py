@@ -0,0 +1,23 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "Agent Code" / "app.py"
+
+@pytest.fixture(scope="session")
+def app():
+    """The agent module, loaded from its file without starting the server or warm-up."""
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ.setdefault("GATEWAY_URL", "https://gateway.test/mcp")
+    os.environ.setdefault("GATEWAY_BACKOFF_BASE", "0.01")  # keep retry sleeps short
+    os.environ.setdefault("GATEWAY_BACKOFF_CAP", "0.02")
+    name = "part36_app"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+WEATHER = {
+    "name": "myWeatherTool___getCityWeather",
+    "description": "Get the current weather for a city",
+    "inputSchema": {"type": "object", "properties": {"city": {"type": "string"}}},
+}
+# Slack only shows up in the description, not in the tool name
+NOTIFIER = {
+    "name": "Notifier___sendUpdate",
+    "description": "Send a message to the team's Slack channel",
+    "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}},
+}
+
+def tool_reply(request_body: dict, text: str = "ok") -> dict:
+    return {"jsonrpc": "2.0", "id": request_body["id"],
+            "result": {"content": [{"type": "text", "text": text}], "isError": False}}
+
+def make_gateway(app, handler, **kwargs):
+    gateway = app.AsyncGatewayClient("https://gateway.test/mcp", lambda: "token", **kwargs)
+    gateway._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return gateway
+
+def use_catalog(app, monkeypatch, tools):
+    catalog = app.ToolCatalog(lambda: tools, app.index_tools)
+    catalog.refresh()
+    monkeypatch.setattr(app, "tool_catalog", catalog)
+    return catalog
+
+def test_slack_tool_known_only_by_description_is_not_retried(app, monkeypatch):
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(503, json={"error": "unavailable"})
+
+    use_catalog(app, monkeypatch, [WEATHER, NOTIFIER])
+    monkeypatch.setattr(app, "async_gateway", make_gateway(app, handler, retries=2, hedge=True))
+    monkeypatch.setattr(app.tool_cache, "_default_ttl", 600)
+
+    result = asyncio.run(app.call_tool(NOTIFIER["name"], {"text": "Deploy finished"}))
+
+    assert "error" in result
+    assert len(requests_seen) == 1
+    assert app.tool_cache.key(NOTIFIER["name"], {"text": "Deploy finished"}) is None
+
+def test_data_tool_is_retried_after_a_5xx(app, monkeypatch):
+    requests_seen = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests_seen.append(body)
+        if len(requests_seen) == 1:
+            return httpx.Response(503, json={"error": "unavailable"})
+        return httpx.Response(200, json=tool_reply(body, "55 F"))
+
+    use_catalog(app, monkeypatch, [WEATHER, NOTIFIER])
+    monkeypatch.setattr(app, "async_gateway", make_gateway(app, handler, retries=2))
+
+    result = asyncio.run(app.call_tool(WEATHER["name"], {"city": "Pune"}))
+
+    assert result["result"]["content"][0]["text"] == "55 F"
+    assert len(requests_seen) == 2
+
+def slow_gateway(app, seconds: float, **kwargs):
+    """Gateway answering every call after `seconds`; .seen and .max_in_flight count the requests."""
+    in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight
+        body = json.loads(request.content)
+        gateway.seen.append(body)
+        in_flight += 1
+        gateway.max_in_flight = max(gateway.max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            in_flight -= 1
+        return httpx.Response(200, json=tool_reply(body))
+
+    gateway = make_gateway(app, handler, **kwargs)
+    gateway.seen, gateway.max_in_flight = [], 0
+    for _ in range(app.ToolHealth.HEDGE_MIN_SAMPLES):
+        gateway.health.record(WEATHER["name"], ok=True, latency=0.01)  # p95 = 10 ms
+    return gateway
+
+def test_hedge_takes_its_own_permit(app):
+    gateway = slow_gateway(app, 0.1, concurrency=2, hedge=True)
+
+    asyncio.run(gateway.call_tool(WEATHER["name"], {"city": "Pune"}))
+
+    assert len(gateway.seen) == 2
+    assert gateway.health.stats["hedges"] == 1
+
+def test_hedge_is_skipped_when_no_permit_is_free(app):
+    gateway = slow_gateway(app, 0.1, concurrency=1, hedge=True)
+
+    asyncio.run(gateway.call_tool(WEATHER["name"], {"city": "Pune"}))
+
+    assert len(gateway.seen) == 1
+    assert gateway.max_in_flight == 1
+    assert gateway.health.stats["hedges"] == 0
+
+def test_backoff_sleep_does_not_hold_a_permit(app, monkeypatch):
+    failed = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        if body["params"]["arguments"]["city"] == "Pune" and not failed:
+            failed.append(body)
+            return httpx.Response(503, json={"error": "unavailable"})
+        return httpx.Response(200, json=tool_reply(body))
+
+    monkeypatch.setattr(app.ToolHealth, "backoff", staticmethod(lambda previous: 0.2))
+    gateway = make_gateway(app, handler, concurrency=1, retries=1)
+    finished = []
+
+    async def call(city):
+        await gateway.call_tool(WEATHER["name"], {"city": city})
+        finished.append(city)
+
+    async def main():
+        await asyncio.gather(call("Pune"), call("Oslo"))
+
+    asyncio.run(main())
+
+    assert finished == ["Oslo", "Pune"]
+
+def test_circuit_opens_after_repeated_failures_and_lets_one_trial_through(app):
+    health = app.ToolHealth(failures=3, reset=0.05)
+    for _ in range(3):
+        assert health.allow("flaky")
+        health.record("flaky", ok=False)
+
+    assert not health.allow("flaky")
+    assert health.open_circuits() == ["flaky"]
+
+    time.sleep(0.06)
+    assert health.allow("flaky")       # the trial call
+    assert not health.allow("flaky")   # only one at a time
+    health.record("flaky", ok=True)
+    assert health.allow("flaky")
+    assert health.stats["circuit_opens"] == 1
+
+def test_open_circuit_fails_fast_without_a_request(app):
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(503, json={"error": "unavailable"})
+
+    gateway = make_gateway(app, handler, retries=0)
+    gateway.health = app.ToolHealth(failures=2, reset=60)
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await gateway.call_tool(WEATHER["name"], {"city": "Pune"})
+        with pytest.raises(app.CircuitOpenError):
+            await gateway.call_tool(WEATHER["name"], {"city": "Pune"})
+
+    asyncio.run(main())
+
+    assert len(requests_seen) == 2
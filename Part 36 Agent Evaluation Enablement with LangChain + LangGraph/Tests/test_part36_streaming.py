@@ -0,0 +1,24 @@
+import asyncio
+
+def failing_turn(app, monkeypatch):
+    """run_agent_async that streams one delta and then fails."""
+    async def run_agent_async(user_text, on_text=None, priority=app.PRIORITY_INTERACTIVE, **kwargs):
+        on_text("Partial")
+        raise RuntimeError("Bedrock unavailable")
+
+    monkeypatch.setattr(app, "run_agent_async", run_agent_async)
+
+def test_flask_stream_ends_with_an_error_event(app, monkeypatch):
+    failing_turn(app, monkeypatch)
+
+    events = list(app.stream_agent("weather in Pune"))
+
+    assert events == [app.sse({"delta": "Partial"}), app.sse({"error": "Bedrock unavailable"})]
+
+def test_agentcore_stream_ends_with_an_error_event(app, monkeypatch):
+    failing_turn(app, monkeypatch)
+
+    async def collect():
+        return [event async for event in app.stream_agent_events("weather in Pune")]
+
+    assert asyncio.run(collect()) == [{"delta": "Partial"}, {"error": "Bedrock unavailable"}]
@@ -18,11 +18,52 @@ bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
 MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
 
 
+def text_deltas(response):
+    """Text pieces of an invoke_model_with_response_stream reply, in order."""
+    for event in response["body"]:
+        chunk = json.loads(event["chunk"]["bytes"]) if "chunk" in event else {}
+        if chunk.get("type") == "content_block_delta" and chunk["delta"].get("type") == "text_delta":
+            yield chunk["delta"]["text"]
+
+
+def remember(runtimeSessionId, history, prompt, reply):
+    # Update ephemeral session memory (limit to last 10 turns)
+    history.append({"role": "user", "text": prompt})
+    history.append({"role": "assistant", "text": reply})
+    SESSION_MEMORY[runtimeSessionId] = history[-10:]  # keep last 10 exchanges only
+
+
+def stream_reply(runtimeSessionId, history, prompt, body):
+    """
+    Yields {"delta": ...} events as Claude writes the reply, then {"message": ...}
+    with the whole reply. AgentCore relays each event to the caller as SSE.
+    """
+    parts = []
+    try:
+        response = bedrock.invoke_model_with_response_stream(
+            modelId=MODEL_ID,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(body)
+        )
+        for text in text_deltas(response):
+            parts.append(text)
+            yield {"delta": text}
+        reply = "".join(parts)
+    except Exception as e:
+        logger.exception("Error streaming from Claude 3 Haiku:")
+        reply = f"Error: {str(e)}"
+
+    remember(runtimeSessionId, history, prompt, reply)
+    yield {"message": reply}
+
+
 @app.entrypoint
 def invoke(payload):
     """
     Ephemeral conversational agent using Claude 3 Haiku via Bedrock.
     Session memory lasts only within the current runtime.
+    Send "stream": true to receive the reply as it is generated (SSE).
     """
 
     # Parse payload safely
@@ -60,6 +101,9 @@ def invoke(payload):
         "messages": messages
     }
 
+    if payload.get("stream"):
+        return stream_reply(runtimeSessionId, history, prompt, body)
+
     # Call Claude 3 Haiku
     try:
         response = bedrock.invoke_model(
@@ -74,11 +118,7 @@ def invoke(payload):
         logger.exception("Error calling Claude 3 Haiku:")
         reply = f"Error: {str(e)}"
 
-    # Update ephemeral session memory (limit to last 10 turns)
-    history.append({"role": "user", "text": prompt})
-    history.append({"role": "assistant", "text": reply})
-    SESSION_MEMORY[runtimeSessionId] = history[-10:]  # keep last 10 exchanges only
-
+    remember(runtimeSessionId, history, prompt, reply)
     return {"message": reply}
 
 